@@ -0,0 +1,131 @@
+/*
+ * Cycle counting benchmark of the LIFE firmware under simavr.
+ *
+ * Built and run by ../benchmark.py.  Timer0 runs unprescaled so its count
+ * plus an overflow counter is the CPU cycle count.  Results are written to
+ * the simavr console register as text lines:
+ *
+ *   cycles <function> <cycles per call>
+ *   state <current_state as hex>
+ *   done
+ *
+ * Copyright (C) 2020 Gregory P. Smith (@gpshead).
+ *
+ * Released under the Apache 2.0 license.
+ * https://www.apache.org/licenses/
+ */
+#include <avr/io.h>
+#include <avr/interrupt.h>
+#include <avr/sleep.h>
+#include "avr_mcu_section.h"
+
+// The firmware itself; its static functions are what we want to time.
+#include "../src/main.cpp"
+
+#ifndef BENCH_GENERATIONS
+#define BENCH_GENERATIONS 100
+#endif
+
+AVR_MCU(F_CPU, "attiny85");
+AVR_MCU_SIMAVR_CONSOLE(&GPIOR0);
+
+// 32 bits so that even 100 generations of slow code cannot wrap it.
+static volatile uint32_t timer_overflows;
+
+ISR(TIMER0_OVF_vect) {
+  ++timer_overflows;
+}
+
+static void cycles_start(void) {
+  TCCR0A = 0;
+  TCCR0B = _BV(CS00);  // No prescaler, one count per cycle.
+  TIMSK |= _BV(TOIE0);
+  sei();
+}
+
+static uint64_t cycles_now(void) {
+  cli();
+  uint8_t count = TCNT0;
+  uint32_t overflows = timer_overflows;
+  if ((TIFR & _BV(TOV0)) && count < 0x80) {
+    ++overflows;  // Overflowed after we disabled interrupts.
+  }
+  sei();
+  return ((uint64_t)overflows << 8) | count;
+}
+
+static void console_putc(const char c) {
+  GPIOR0 = c;
+}
+
+static void console_puts(const char *text) {
+  while (*text) console_putc(*text++);
+}
+
+static void console_hex(const uint8_t value) {
+  static const char kHex[] = "0123456789abcdef";
+  console_putc(kHex[value >> 4]);
+  console_putc(kHex[value & 0xf]);
+}
+
+static void console_u32(uint32_t value) {
+  char digits[11];
+  uint8_t idx = sizeof(digits);
+  digits[--idx] = '\0';
+  do {
+    digits[--idx] = '0' + (value % 10);
+    value /= 10;
+  } while (value);
+  console_puts(&digits[idx]);
+}
+
+static void report(const char *name, const uint64_t cycles, const uint16_t calls) {
+  console_puts("cycles ");
+  console_puts(name);
+  console_putc(' ');
+  console_u32((uint32_t)(cycles / calls));
+  console_putc('\n');
+}
+
+int main(void) {
+  cycles_start();
+  memset(current_state, 0, LIFE_STATE_BYTES);
+  load_seed_pattern(0);
+
+  uint64_t start = cycles_now();
+  uint64_t overhead = cycles_now() - start;
+
+  start = cycles_now();
+  for (uint16_t gen = 0; gen < BENCH_GENERATIONS; ++gen) {
+    culture_life_once();
+  }
+  report("culture_life_once", cycles_now() - start - overhead, BENCH_GENERATIONS);
+
+  start = cycles_now();
+  refresh_display();
+  report("refresh_display", cycles_now() - start - overhead, 1);
+
+  volatile uint8_t sink = 0;
+  start = cycles_now();
+  for (uint8_t led = 0; led < NUM_DISC_LEDS; ++led) {
+    sink += get_culture_value(next_state, led);
+  }
+  report("get_culture_value", cycles_now() - start - overhead, NUM_DISC_LEDS);
+
+  start = cycles_now();
+  for (uint8_t led = 0; led < NUM_DISC_LEDS; ++led) {
+    set_culture_value(next_state, led, led);
+  }
+  report("set_culture_value", cycles_now() - start - overhead, NUM_DISC_LEDS);
+
+  console_puts("state ");
+  for (uint8_t idx = 0; idx < LIFE_STATE_BYTES; ++idx) {
+    console_hex(current_state[idx]);
+  }
+  console_puts("\ndone\n");
+
+  cli();
+  sleep_enable();
+  sleep_cpu();  // simavr exits when sleeping with interrupts disabled.
+  for (;;) {}
+}
@@ -0,0 +1,17 @@
+/*
+ * Just enough of Arduino.h to build main.cpp for the simavr benchmark.
+ *
+ * Copyright (C) 2020 Gregory P. Smith (@gpshead).
+ *
+ * Released under the Apache 2.0 license.
+ * https://www.apache.org/licenses/
+ */
+#ifndef _BENCH_ARDUINO_H_
+#define _BENCH_ARDUINO_H_
+
+#include <stdint.h>
+
+// Nothing we benchmark should wait on the wall clock.
+static inline void delay(unsigned long) {}
+
+#endif  // _BENCH_ARDUINO_H_
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# vim: set sw=4 expandtab ai
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Cycle count the firmware under simavr and check it against Python.
+
+Builds bench/bench.cpp (which includes src/main.cpp) with avr-g++ for an
+ATtiny85, runs it in simavr and reports cycles per culture_life_once(),
+refresh_display(), get_culture_value() and set_culture_value() call.  The
+culture state after the benchmarked generations must match the MicroPython
+reference implementation or this exits non-zero.
+
+Usage:
+  benchmark.py [--generations 100] [--f-cpu 8000000]
+      [--simavr-include /usr/include/simavr/avr]
+
+Requires avr-gcc, avr-libc and simavr (Debian: gcc-avr avr-libc simavr).
+"""
+
+import argparse
+import os
+import pathlib
+import re
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import apa102
+import life
+import patterns
+
+HERE = pathlib.Path(__file__).parent
+BITS_PER_CULTURE = 2
+MAX_CULTURE_VALUE = 3
+
+
+def build(elf_path, generations, f_cpu, simavr_include):
+    subprocess.check_call([
+        'avr-g++', '-mmcu=attiny85', '-Os', '-std=gnu++11',
+        '-DF_CPU=%dUL' % f_cpu, '-DBENCH_GENERATIONS=%d' % generations,
+        '-I', str(HERE / 'bench' / 'shim'), '-I', str(HERE / 'src'),
+        '-I', simavr_include,
+        str(HERE / 'bench' / 'bench.cpp'),
+        str(HERE / 'src' / 'led_disc_config.cpp'),
+        str(HERE / 'src' / 'tiny_dotstar.cpp'),
+        str(HERE / 'src' / 'third_party' / 'attiny85_spi.cpp'),
+        '-o', str(elf_path)])
+
+
+def run(elf_path, f_cpu, timeout=600):
+    result = subprocess.run(
+        ['simavr', '-m', 'attiny85', '-f', str(f_cpu), str(elf_path)],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        universal_newlines=True, timeout=timeout, check=True)
+    return result.stdout
+
+
+def parse_output(output):
+    """Returns ({function: cycles}, state bytes) from the bench output."""
+    cycles = {}
+    state = None
+    done = False
+    for line in re.sub(r'\x1b\[[0-9;]*m', '', output).splitlines():
+        # simavr decorates console lines with a prefix and colors.
+        fields = line.split()
+        if 'cycles' in fields:
+            idx = fields.index('cycles')
+            cycles[fields[idx + 1]] = int(fields[idx + 2])
+        elif 'state' in fields:
+            state = bytes.fromhex(fields[fields.index('state') + 1])
+        elif 'done' in fields:
+            done = True
+    if not done or state is None:
+        raise RuntimeError('benchmark did not complete:\n' + output)
+    return cycles, state
+
+
+def unpack_state(packed):
+    """Expands the firmware's 2 bits per LED state to one byte per LED."""
+    per_byte = 8 // BITS_PER_CULTURE
+    return bytes((packed[led // per_byte] >> (led % per_byte * BITS_PER_CULTURE))
+                 & MAX_CULTURE_VALUE for led in range(apa102.NUM_DISC_LEDS))
+
+
+def generated_config(src_dir=HERE / 'src'):
+    """Returns (seed 0 LEDs, stay_alive, new_born) from the generated tables.
+
+    generate_tables.py may have taken its seeds and rules from a pattern
+    bank or the command line, so read back what the firmware was built with.
+    """
+    header = (src_dir / 'led_disc_config.h').read_text()
+    masks = dict(re.findall(r'#define LIFE_(\w+)_MASK 0x([0-9a-f]+)', header))
+    source = (src_dir / 'led_disc_config.cpp').read_text()
+    seeds = source[source.index('kSeedPatterns['):]
+    seed_0 = re.search(r'= {\s*{([^}]*)}', seeds).group(1)
+    bitset = bytes(int(value, 16) for value in re.findall(r'0x\w+', seed_0))
+    leds = [led for led in range(apa102.NUM_DISC_LEDS)
+            if bitset[led >> 3] >> (led & 7) & 1]
+    return (leds, patterns.mask_to_rules(int(masks['STAY_ALIVE'], 16)),
+            patterns.mask_to_rules(int(masks['NEW_BORN'], 16)))
+
+
+def reference_state(generations, src_dir=HERE / 'src'):
+    """What the firmware state should be after generations from seed 0."""
+    seed, stay_alive, new_born = generated_config(src_dir)
+    state = bytearray(apa102.NUM_DISC_LEDS)
+    for led in seed:
+        state[led] = 1
+    for _ in range(generations):
+        state = life.next_generation(life.DISC_NEIGHBORS, state, stay_alive,
+                                     new_born, MAX_CULTURE_VALUE)
+    return bytes(state)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--generations', type=int, default=100)
+    parser.add_argument('--f-cpu', type=int, default=8000000)
+    parser.add_argument('--simavr-include', default='/usr/include/simavr/avr')
+    args = parser.parse_args(argv[1:])
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        elf_path = pathlib.Path(build_dir) / 'bench.elf'
+        build(elf_path, args.generations, args.f_cpu, args.simavr_include)
+        output = run(elf_path, args.f_cpu)
+    cycles, packed_state = parse_output(output)
+
+    for name, count in sorted(cycles.items()):
+        print('%-20s %9d cycles  %8.3f ms' %
+              (name, count, count * 1000 / args.f_cpu))
+    frame_cycles = cycles['culture_life_once'] + cycles['refresh_display']
+    print('Compute + display per frame: %.1f ms at %d MHz' %
+          (frame_cycles * 1000 / args.f_cpu, args.f_cpu // 1000000))
+
+    if unpack_state(packed_state) != reference_state(args.generations):
+        print('FAIL: firmware state after', args.generations,
+              'generations differs from the Python reference.')
+        return 1
+    print('OK: firmware state after', args.generations,
+          'generations matches the Python reference.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# vim: set sw=4 expandtab ai
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Generate the 8-bit firmware's constant tables from the Python code.
+
+The LED topology, LIFE rules and seed patterns live in one place: the
+MicroPython modules one directory up.  This writes src/led_disc_config.h
+and src/led_disc_config.cpp from them.  Output is byte-for-byte
+reproducible; tests/generate_tables_test.py checks it is up to date.
+
+Usage:
+  generate_tables.py [--stay-alive 2,3] [--new-born 2,5] [--bank patterns.bin]
+
+This is the only exporter of kSeedPatterns; give it --bank to take the
+seeds from a pattern bank built by utils/build_pattern_bank.py.
+
+Neighbor encoding, one byte per LED instead of a padded [255][6] table:
+
+Every LED (but the center) neighbors the LEDs before and after it in its
+own ring.  Its neighbors in the adjacent outer and inner rings are a run
+of 0-2 consecutive LEDs.  Walking around a ring, the first LED of each
+run only ever moves forward by 0-2 positions.  So each LED gets a nibble
+per adjacent ring: bits 0-1 are the run length and bits 2-3 how far the
+run start moved since the previous LED in this ring.  The low nibble
+describes the outer ring, the high nibble the inner ring.  The center LED
+neighbors its entire outer ring and its code is unused.
+"""
+
+import argparse
+import os
+import pathlib
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from apa102 import DISC_RINGS, DISC_RING_OFFSETS, NUM_DISC_LEDS, NUM_RINGS
+import life
+import patterns
+import reseed
+
+SRC_DIR = pathlib.Path(__file__).parent / 'src'
+
+_LICENSE = '''/*
+ * GENERATED by 8bit/generate_tables.py from the MicroPython sources.
+ * DO NOT EDIT.  Re-run the generator instead.
+ *
+ * Copyright (C) 2020 Gregory P. Smith (@gpshead).
+ *
+ * Released under the Apache 2.0 license.
+ * https://www.apache.org/licenses/
+ */
+'''
+
+
+def _ring_of(led):
+    for ring, (size, offset) in enumerate(zip(DISC_RINGS, DISC_RING_OFFSETS)):
+        if led < offset + size:
+            return ring
+    raise ValueError(led)
+
+
+def _run_in_ring(neighbors, ring):
+    """Returns (first position, length) of neighbors' run within ring."""
+    size, offset = DISC_RINGS[ring], DISC_RING_OFFSETS[ring]
+    positions = sorted(n - offset for n in neighbors if _ring_of(n) == ring)
+    if not positions:
+        return None, 0
+    if len(positions) == 2 and positions[1] - positions[0] != 1:
+        if positions != [0, size - 1]:
+            raise ValueError('non-consecutive neighbors %r' % positions)
+        return size - 1, 2  # The run wraps around the ring.
+    if len(positions) > 2:
+        raise ValueError('too many neighbors in one ring %r' % positions)
+    return positions[0], len(positions)
+
+
+def encode_neighbors(neighbors=life.DISC_NEIGHBORS):
+    """Returns the one byte per LED neighbor codes."""
+    codes = bytearray(NUM_DISC_LEDS)
+    for ring, (size, offset) in enumerate(zip(DISC_RINGS, DISC_RING_OFFSETS)):
+        if size == 1:
+            continue
+        prev_first = {ring - 1: 0, ring + 1: 0}
+        for pos in range(size):
+            led = offset + pos
+            code = 0
+            for shift, adjacent in ((0, ring - 1), (4, ring + 1)):
+                if not 0 <= adjacent < NUM_RINGS:
+                    continue
+                first, length = _run_in_ring(neighbors[led], adjacent)
+                if not length:
+                    continue
+                delta = first - prev_first[adjacent]
+                if not 0 <= delta <= 3:
+                    raise ValueError('LED %d delta %d does not fit' %
+                                     (led, delta))
+                prev_first[adjacent] = first
+                code |= (length | delta << 2) << shift
+            codes[led] = code
+    if decode_neighbors(codes) != tuple(bytes(sorted(n)) for n in neighbors):
+        raise ValueError('neighbor encoding does not round trip')
+    return bytes(codes)
+
+
+def decode_neighbors(codes):
+    """The algorithm culture_life_once() uses, for testing the encoding."""
+    decoded = []
+    for ring, (size, offset) in enumerate(zip(DISC_RINGS, DISC_RING_OFFSETS)):
+        if size == 1:
+            outer = range(DISC_RING_OFFSETS[ring - 1], offset)
+            decoded.append(bytes(outer))
+            continue
+        run_pos = {ring - 1: 0, ring + 1: 0}
+        for pos in range(size):
+            code = codes[offset + pos]
+            found = {offset + (pos - 1) % size, offset + (pos + 1) % size}
+            for shift, adjacent in ((0, ring - 1), (4, ring + 1)):
+                nibble = (code >> shift) & 0xf
+                if not nibble:
+                    continue
+                run_pos[adjacent] += nibble >> 2
+                adjacent_size = DISC_RINGS[adjacent]
+                for idx in range(nibble & 3):
+                    found.add(DISC_RING_OFFSETS[adjacent] +
+                              (run_pos[adjacent] + idx) % adjacent_size)
+            decoded.append(bytes(sorted(found)))
+    return tuple(decoded)
+
+
+def _c_array(values, per_line=12, indent='  '):
+    values = list(values)
+    lines = []
+    for start in range(0, len(values), per_line):
+        chunk = values[start:start + per_line]
+        lines.append(indent + ', '.join('0x%02x' % v for v in chunk) + ',')
+    lines[-1] = lines[-1][:-1]
+    return '\n'.join(lines)
+
+
+def generate(stay_alive=(2, 3), new_born=(2, 5), seeds=reseed.LIBRARY):
+    """Returns {filename: contents} for the generated sources."""
+    if not seeds:
+        # The firmware always starts from seed pattern 0.
+        raise ValueError('at least one seed pattern is required')
+    codes = encode_neighbors()
+    rings = ', '.join(str(size) for size in DISC_RINGS)
+    header = _LICENSE + '''#ifndef _LED_DISC_CONFIG_H_
+#define _LED_DISC_CONFIG_H_
+
+#include <stdint.h>
+#include <avr/pgmspace.h>
+
+#define NUM_DISC_LEDS %(leds)d
+#define NUM_DISC_RINGS %(rings)d
+
+// Bit n set if a live cell with n live neighbors stays alive.
+#define LIFE_STAY_ALIVE_MASK 0x%(stay)02x
+// Bit n set if a dead cell with n live neighbors comes to life.
+#define LIFE_NEW_BORN_MASK 0x%(born)02x
+#define NEIGHBORS_SUPPORT_LIFE(num_alive) ((LIFE_STAY_ALIVE_MASK >> (num_alive)) & 1)
+#define NEIGHBORS_SPAWN_LIFE(num_alive) ((LIFE_NEW_BORN_MASK >> (num_alive)) & 1)
+
+// Neighbor codes: low nibble describes the run of neighbors in the outer
+// ring, high nibble the inner ring.  Bits 0-1 of a nibble are the run
+// length, bits 2-3 how far its start moved since the previous LED.
+#define NEIGHBOR_RUN_LENGTH(nibble) ((nibble) & 0x3)
+#define NEIGHBOR_RUN_DELTA(nibble) ((nibble) >> 2)
+
+// Seed patterns are bitsets: LED n is alive if bit n%%8 of byte n/8 is set.
+#define NUM_SEED_PATTERNS %(num_seeds)d
+#define SEED_PATTERN_BYTES %(seed_bytes)d
+
+extern const uint8_t PROGMEM kDiscRings[NUM_DISC_RINGS];
+extern const uint8_t PROGMEM kDiscNeighborCodes[NUM_DISC_LEDS];
+extern const uint8_t PROGMEM kSeedPatterns[NUM_SEED_PATTERNS][SEED_PATTERN_BYTES];
+
+#endif  // _LED_DISC_CONFIG_H_
+''' % dict(leds=NUM_DISC_LEDS, rings=NUM_RINGS,
+           stay=patterns.rules_to_mask(stay_alive),
+           born=patterns.rules_to_mask(new_born),
+           num_seeds=len(seeds), seed_bytes=patterns.CELL_BYTES)
+
+    seed_rows = []
+    for seed in seeds:
+        seed_rows.append('  {\n%s\n  }' % _c_array(
+            patterns.cells_to_bitset(seed), indent='    '))
+    source = _LICENSE + '''#include "led_disc_config.h"
+#include <stdint.h>
+#include <avr/pgmspace.h>
+
+const uint8_t PROGMEM kDiscRings[NUM_DISC_RINGS] = {
+  %(rings)s};
+
+const uint8_t PROGMEM kDiscNeighborCodes[NUM_DISC_LEDS] = {
+%(codes)s
+};
+
+const uint8_t PROGMEM kSeedPatterns[NUM_SEED_PATTERNS][SEED_PATTERN_BYTES] = {
+%(seeds)s
+};
+''' % dict(rings=rings, codes=_c_array(codes), seeds=',\n'.join(seed_rows))
+    return {'led_disc_config.h': header, 'led_disc_config.cpp': source}
+
+
+def _rules(text):
+    return tuple(int(count) for count in text.split(',') if count)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stay-alive', type=_rules, default=(2, 3))
+    parser.add_argument('--new-born', type=_rules, default=(2, 5))
+    parser.add_argument('--bank', help='take seeds from this pattern bank '
+                        'instead of reseed.LIBRARY')
+    parser.add_argument('--max-seeds', type=int, default=8)
+    args = parser.parse_args(argv[1:])
+    seeds = reseed.LIBRARY
+    if args.bank:
+        bank = patterns.PatternBank.load(args.bank)
+        seeds = [bank.cells(idx) for idx in
+                 bank.matching(args.stay_alive, args.new_born)]
+        if not seeds:
+            parser.error('%s has no patterns scored under these rules' %
+                         args.bank)
+    files = generate(args.stay_alive, args.new_born, seeds[:args.max_seeds])
+    for name, contents in sorted(files.items()):
+        with open(SRC_DIR / name, 'w', newline='\n') as output:
+            output.write(contents)
+        print('Wrote', SRC_DIR / name)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
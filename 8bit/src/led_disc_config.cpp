@@ -1,6 +1,9 @@
 /*
+ * GENERATED by 8bit/generate_tables.py from the MicroPython sources.
+ * DO NOT EDIT.  Re-run the generator instead.
+ *
  * Copyright (C) 2020 Gregory P. Smith (@gpshead).
- * 
+ *
  * Released under the Apache 2.0 license.
  * https://www.apache.org/licenses/
  */
@@ -11,265 +14,55 @@
 const uint8_t PROGMEM kDiscRings[NUM_DISC_RINGS] = {
   48, 44, 40, 32, 28, 24, 20, 12, 6, 1};
 
-// Computed by this code:
-// https://github.com/gpshead/life_circle/blob/master/tests/life_test.py
-// 255 is the sentinel "end of list" value.
-// This is inefficient storage, but we've got a rediculious 8KiB of PROGMEM
-// on the ATtiny85 so why get creative?
-const uint8_t PROGMEM kDiscNeighbors[NUM_DISC_LEDS][MAX_DISC_NEIGHBORS] = {
-  {1, 47, 48, 255, 255, 255},
-  {0, 2, 49, 255, 255, 255},
-  {1, 3, 50, 255, 255, 255},
-  {2, 4, 51, 255, 255, 255},
-  {3, 5, 52, 255, 255, 255},
-  {4, 6, 52, 53, 255, 255},
-  {5, 7, 53, 54, 255, 255},
-  {6, 8, 54, 55, 255, 255},
-  {7, 9, 55, 56, 255, 255},
-  {8, 10, 56, 255, 255, 255},
-  {9, 11, 57, 255, 255, 255},
-  {10, 12, 58, 255, 255, 255},
-  {11, 13, 59, 255, 255, 255},
-  {12, 14, 60, 255, 255, 255},
-  {13, 15, 61, 255, 255, 255},
-  {14, 16, 62, 255, 255, 255},
-  {15, 17, 63, 255, 255, 255},
-  {16, 18, 63, 64, 255, 255},
-  {17, 19, 64, 65, 255, 255},
-  {18, 20, 65, 66, 255, 255},
-  {19, 21, 66, 67, 255, 255},
-  {20, 22, 67, 255, 255, 255},
-  {21, 23, 68, 255, 255, 255},
-  {22, 24, 69, 255, 255, 255},
-  {23, 25, 70, 255, 255, 255},
-  {24, 26, 71, 255, 255, 255},
-  {25, 27, 72, 255, 255, 255},
-  {26, 28, 73, 255, 255, 255},
-  {27, 29, 74, 255, 255, 255},
-  {28, 30, 74, 75, 255, 255},
-  {29, 31, 75, 76, 255, 255},
-  {30, 32, 76, 77, 255, 255},
-  {31, 33, 77, 78, 255, 255},
-  {32, 34, 78, 255, 255, 255},
-  {33, 35, 79, 255, 255, 255},
-  {34, 36, 80, 255, 255, 255},
-  {35, 37, 81, 255, 255, 255},
-  {36, 38, 82, 255, 255, 255},
-  {37, 39, 83, 255, 255, 255},
-  {38, 40, 84, 255, 255, 255},
-  {39, 41, 85, 255, 255, 255},
-  {40, 42, 85, 86, 255, 255},
-  {41, 43, 86, 87, 255, 255},
-  {42, 44, 87, 88, 255, 255},
-  {43, 45, 88, 89, 255, 255},
-  {44, 46, 89, 255, 255, 255},
-  {45, 47, 90, 255, 255, 255},
-  {0, 46, 91, 255, 255, 255},
-  {0, 49, 91, 92, 255, 255},
-  {1, 48, 50, 93, 255, 255},
-  {2, 49, 51, 94, 255, 255},
-  {3, 50, 52, 95, 255, 255},
-  {4, 5, 51, 53, 95, 96},
-  {5, 6, 52, 54, 96, 97},
-  {6, 7, 53, 55, 97, 98},
-  {7, 8, 54, 56, 98, 99},
-  {9, 55, 57, 99, 255, 255},
-  {10, 56, 58, 100, 255, 255},
-  {11, 57, 59, 101, 255, 255},
-  {12, 58, 60, 102, 255, 255},
-  {13, 59, 61, 103, 255, 255},
-  {14, 60, 62, 104, 255, 255},
-  {15, 61, 63, 105, 255, 255},
-  {16, 17, 62, 64, 105, 106},
-  {17, 18, 63, 65, 106, 107},
-  {18, 19, 64, 66, 107, 108},
-  {19, 20, 65, 67, 108, 109},
-  {21, 66, 68, 109, 255, 255},
-  {22, 67, 69, 110, 255, 255},
-  {23, 68, 70, 111, 255, 255},
-  {24, 69, 71, 112, 255, 255},
-  {25, 70, 72, 113, 255, 255},
-  {26, 71, 73, 114, 255, 255},
-  {27, 72, 74, 115, 255, 255},
-  {28, 29, 73, 75, 115, 116},
-  {29, 30, 74, 76, 116, 117},
-  {30, 31, 75, 77, 117, 118},
-  {31, 32, 76, 78, 118, 119},
-  {33, 77, 79, 119, 255, 255},
-  {34, 78, 80, 120, 255, 255},
-  {35, 79, 81, 121, 255, 255},
-  {36, 80, 82, 122, 255, 255},
-  {37, 81, 83, 123, 255, 255},
-  {38, 82, 84, 124, 255, 255},
-  {39, 83, 85, 125, 255, 255},
-  {40, 41, 84, 86, 125, 126},
-  {41, 42, 85, 87, 126, 127},
-  {42, 43, 86, 88, 127, 128},
-  {43, 44, 87, 89, 128, 129},
-  {45, 88, 90, 129, 255, 255},
-  {46, 89, 91, 130, 255, 255},
-  {47, 48, 90, 131, 255, 255},
-  {48, 93, 131, 132, 255, 255},
-  {49, 92, 94, 133, 255, 255},
-  {50, 93, 95, 133, 134, 255},
-  {51, 94, 96, 134, 135, 255},
-  {52, 53, 95, 97, 135, 255},
-  {53, 54, 96, 98, 136, 255},
-  {54, 55, 97, 99, 137, 255},
-  {56, 98, 100, 137, 138, 255},
-  {57, 99, 101, 138, 139, 255},
-  {58, 100, 102, 139, 255, 255},
-  {59, 101, 103, 140, 255, 255},
-  {60, 102, 104, 141, 255, 255},
-  {61, 103, 105, 141, 142, 255},
-  {62, 104, 106, 142, 143, 255},
-  {63, 64, 105, 107, 143, 255},
-  {64, 65, 106, 108, 144, 255},
-  {65, 66, 107, 109, 145, 255},
-  {67, 108, 110, 145, 146, 255},
-  {68, 109, 111, 146, 147, 255},
-  {69, 110, 112, 147, 255, 255},
-  {70, 111, 113, 148, 255, 255},
-  {71, 112, 114, 149, 255, 255},
-  {72, 113, 115, 149, 150, 255},
-  {73, 114, 116, 150, 151, 255},
-  {74, 75, 115, 117, 151, 255},
-  {75, 76, 116, 118, 152, 255},
-  {76, 77, 117, 119, 153, 255},
-  {78, 118, 120, 153, 154, 255},
-  {79, 119, 121, 154, 155, 255},
-  {80, 120, 122, 155, 255, 255},
-  {81, 121, 123, 156, 255, 255},
-  {82, 122, 124, 157, 255, 255},
-  {83, 123, 125, 157, 158, 255},
-  {84, 124, 126, 158, 159, 255},
-  {85, 86, 125, 127, 159, 255},
-  {86, 87, 126, 128, 160, 255},
-  {87, 88, 127, 129, 161, 255},
-  {89, 128, 130, 161, 162, 255},
-  {90, 129, 131, 162, 163, 255},
-  {91, 92, 130, 163, 255, 255},
-  {92, 133, 163, 164, 255, 255},
-  {93, 132, 134, 165, 255, 255},
-  {94, 95, 133, 135, 166, 255},
-  {96, 134, 136, 166, 167, 255},
-  {97, 135, 137, 167, 168, 255},
-  {98, 136, 138, 168, 169, 255},
-  {99, 100, 137, 139, 169, 255},
-  {101, 138, 140, 170, 255, 255},
-  {102, 139, 141, 171, 255, 255},
-  {103, 140, 142, 172, 255, 255},
-  {104, 105, 141, 143, 173, 255},
-  {106, 142, 144, 173, 174, 255},
-  {107, 143, 145, 174, 175, 255},
-  {108, 144, 146, 175, 176, 255},
-  {109, 110, 145, 147, 176, 255},
-  {111, 146, 148, 177, 255, 255},
-  {112, 147, 149, 178, 255, 255},
-  {113, 148, 150, 179, 255, 255},
-  {114, 115, 149, 151, 180, 255},
-  {116, 150, 152, 180, 181, 255},
-  {117, 151, 153, 181, 182, 255},
-  {118, 152, 154, 182, 183, 255},
-  {119, 120, 153, 155, 183, 255},
-  {121, 154, 156, 184, 255, 255},
-  {122, 155, 157, 185, 255, 255},
-  {123, 156, 158, 186, 255, 255},
-  {124, 125, 157, 159, 187, 255},
-  {126, 158, 160, 187, 188, 255},
-  {127, 159, 161, 188, 189, 255},
-  {128, 160, 162, 189, 190, 255},
-  {129, 130, 161, 163, 190, 255},
-  {131, 132, 162, 191, 255, 255},
-  {132, 165, 191, 192, 255, 255},
-  {133, 164, 166, 193, 255, 255},
-  {134, 165, 167, 194, 255, 255},
-  {135, 136, 166, 168, 194, 195},
-  {136, 137, 167, 169, 195, 196},
-  {138, 168, 170, 196, 255, 255},
-  {139, 169, 171, 197, 255, 255},
-  {140, 170, 172, 198, 255, 255},
-  {141, 171, 173, 199, 255, 255},
-  {142, 172, 174, 200, 255, 255},
-  {143, 144, 173, 175, 200, 201},
-  {144, 145, 174, 176, 201, 202},
-  {146, 175, 177, 202, 255, 255},
-  {147, 176, 178, 203, 255, 255},
-  {148, 177, 179, 204, 255, 255},
-  {149, 178, 180, 205, 255, 255},
-  {150, 179, 181, 206, 255, 255},
-  {151, 152, 180, 182, 206, 207},
-  {152, 153, 181, 183, 207, 208},
-  {154, 182, 184, 208, 255, 255},
-  {155, 183, 185, 209, 255, 255},
-  {156, 184, 186, 210, 255, 255},
-  {157, 185, 187, 211, 255, 255},
-  {158, 186, 188, 212, 255, 255},
-  {159, 160, 187, 189, 212, 213},
-  {160, 161, 188, 190, 213, 214},
-  {162, 189, 191, 214, 255, 255},
-  {163, 164, 190, 215, 255, 255},
-  {164, 193, 215, 216, 255, 255},
-  {165, 192, 194, 217, 255, 255},
-  {166, 167, 193, 195, 217, 218},
-  {167, 168, 194, 196, 218, 219},
-  {169, 195, 197, 219, 255, 255},
-  {170, 196, 198, 220, 255, 255},
-  {171, 197, 199, 221, 255, 255},
-  {172, 198, 200, 222, 255, 255},
-  {173, 174, 199, 201, 222, 223},
-  {174, 175, 200, 202, 223, 224},
-  {176, 201, 203, 224, 255, 255},
-  {177, 202, 204, 225, 255, 255},
-  {178, 203, 205, 226, 255, 255},
-  {179, 204, 206, 227, 255, 255},
-  {180, 181, 205, 207, 227, 228},
-  {181, 182, 206, 208, 228, 229},
-  {183, 207, 209, 229, 255, 255},
-  {184, 208, 210, 230, 255, 255},
-  {185, 209, 211, 231, 255, 255},
-  {186, 210, 212, 232, 255, 255},
-  {187, 188, 211, 213, 232, 233},
-  {188, 189, 212, 214, 233, 234},
-  {190, 213, 215, 234, 255, 255},
-  {191, 192, 214, 235, 255, 255},
-  {192, 217, 235, 236, 255, 255},
-  {193, 216, 218, 236, 237, 255},
-  {194, 195, 217, 219, 237, 255},
-  {195, 196, 218, 220, 238, 255},
-  {197, 219, 221, 238, 239, 255},
-  {198, 220, 222, 239, 255, 255},
-  {199, 221, 223, 239, 240, 255},
-  {200, 201, 222, 224, 240, 255},
-  {201, 202, 223, 225, 241, 255},
-  {203, 224, 226, 241, 242, 255},
-  {204, 225, 227, 242, 255, 255},
-  {205, 226, 228, 242, 243, 255},
-  {206, 207, 227, 229, 243, 255},
-  {207, 208, 228, 230, 244, 255},
-  {209, 229, 231, 244, 245, 255},
-  {210, 230, 232, 245, 255, 255},
-  {211, 231, 233, 245, 246, 255},
-  {212, 213, 232, 234, 246, 255},
-  {213, 214, 233, 235, 247, 255},
-  {215, 216, 234, 236, 247, 255},
-  {216, 237, 247, 248, 255, 255},
-  {217, 218, 236, 238, 248, 249},
-  {219, 237, 239, 249, 255, 255},
-  {221, 238, 240, 249, 250, 255},
-  {222, 223, 239, 241, 250, 255},
-  {224, 240, 242, 250, 251, 255},
-  {226, 241, 243, 251, 255, 255},
-  {227, 228, 242, 244, 251, 252},
-  {229, 243, 245, 252, 255, 255},
-  {231, 244, 246, 252, 253, 255},
-  {232, 233, 245, 247, 253, 255},
-  {234, 236, 246, 248, 253, 255},
-  {236, 249, 253, 254, 255, 255},
-  {238, 248, 250, 254, 255, 255},
-  {240, 249, 251, 254, 255, 255},
-  {242, 250, 252, 254, 255, 255},
-  {244, 251, 253, 254, 255, 255},
-  {246, 248, 252, 254, 255, 255},
-  {248, 249, 250, 251, 252, 253}
-};
\ No newline at end of file
+const uint8_t PROGMEM kDiscNeighborCodes[NUM_DISC_LEDS] = {
+  0x10, 0x50, 0x50, 0x50, 0x50, 0x20, 0x60, 0x60, 0x60, 0x50, 0x50, 0x50,
+  0x50, 0x50, 0x50, 0x50, 0x50, 0x20, 0x60, 0x60, 0x60, 0x50, 0x50, 0x50,
+  0x50, 0x50, 0x50, 0x50, 0x50, 0x20, 0x60, 0x60, 0x60, 0x50, 0x50, 0x50,
+  0x50, 0x50, 0x50, 0x50, 0x50, 0x20, 0x60, 0x60, 0x60, 0x50, 0x50, 0x50,
+  0x11, 0x55, 0x55, 0x55, 0x26, 0x66, 0x66, 0x66, 0x59, 0x55, 0x55, 0x55,
+  0x55, 0x55, 0x55, 0x26, 0x66, 0x66, 0x66, 0x59, 0x55, 0x55, 0x55, 0x55,
+  0x55, 0x55, 0x26, 0x66, 0x66, 0x66, 0x59, 0x55, 0x55, 0x55, 0x55, 0x55,
+  0x55, 0x26, 0x66, 0x66, 0x66, 0x59, 0x55, 0x55, 0x11, 0x55, 0x25, 0x65,
+  0x56, 0x56, 0x56, 0x29, 0x65, 0x55, 0x55, 0x55, 0x25, 0x65, 0x56, 0x56,
+  0x56, 0x29, 0x65, 0x55, 0x55, 0x55, 0x25, 0x65, 0x56, 0x56, 0x56, 0x29,
+  0x65, 0x55, 0x55, 0x55, 0x25, 0x65, 0x56, 0x56, 0x56, 0x29, 0x65, 0x55,
+  0x11, 0x55, 0x56, 0x29, 0x65, 0x65, 0x56, 0x59, 0x55, 0x55, 0x56, 0x29,
+  0x65, 0x65, 0x56, 0x59, 0x55, 0x55, 0x56, 0x29, 0x65, 0x65, 0x56, 0x59,
+  0x55, 0x55, 0x56, 0x29, 0x65, 0x65, 0x56, 0x59, 0x11, 0x55, 0x55, 0x26,
+  0x66, 0x59, 0x55, 0x55, 0x55, 0x55, 0x26, 0x66, 0x59, 0x55, 0x55, 0x55,
+  0x55, 0x26, 0x66, 0x59, 0x55, 0x55, 0x55, 0x55, 0x26, 0x66, 0x59, 0x55,
+  0x11, 0x55, 0x26, 0x66, 0x59, 0x55, 0x55, 0x55, 0x26, 0x66, 0x59, 0x55,
+  0x55, 0x55, 0x26, 0x66, 0x59, 0x55, 0x55, 0x55, 0x26, 0x66, 0x59, 0x55,
+  0x11, 0x25, 0x56, 0x56, 0x29, 0x55, 0x25, 0x56, 0x56, 0x29, 0x55, 0x25,
+  0x56, 0x56, 0x29, 0x55, 0x25, 0x56, 0x56, 0x29, 0x11, 0x26, 0x59, 0x29,
+  0x56, 0x29, 0x59, 0x26, 0x59, 0x29, 0x56, 0x29, 0x11, 0x19, 0x19, 0x19,
+  0x19, 0x19, 0x00
+};
+
+const uint8_t PROGMEM kSeedPatterns[NUM_SEED_PATTERNS][SEED_PATTERN_BYTES] = {
+  {
+    0x22, 0xfe, 0x00, 0x00, 0x00, 0x00, 0x00, 0xfc, 0x01, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x0f, 0x02, 0x00, 0x00, 0x00, 0x2f, 0x78
+  },
+  {
+    0x24, 0x00, 0x00, 0x70, 0x00, 0x80, 0x00, 0x00, 0x22, 0x00, 0x00, 0x80,
+    0x3a, 0x00, 0x01, 0x00, 0x04, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x10,
+    0x00, 0x01, 0x00, 0x00, 0x80, 0x00, 0x00, 0x70
+  },
+  {
+    0x00, 0x04, 0x20, 0x00, 0x30, 0x00, 0x08, 0x08, 0x40, 0x02, 0x00, 0x01,
+    0x02, 0x00, 0x00, 0x90, 0x00, 0x35, 0x04, 0x00, 0x00, 0x80, 0x00, 0x01,
+    0x49, 0xd3, 0x21, 0x42, 0x08, 0x4a, 0x00, 0x4a
+  },
+  {
+    0x01, 0x10, 0x01, 0x00, 0x00, 0x00, 0x00, 0x10, 0x10, 0x00, 0x89, 0x04,
+    0x93, 0x00, 0x12, 0x03, 0x44, 0x58, 0x88, 0x00, 0x22, 0x88, 0x42, 0xc0,
+    0x00, 0x04, 0x08, 0x44, 0x00, 0x00, 0x00, 0x43
+  },
+  {
+    0x05, 0x00, 0x00, 0x06, 0x00, 0x12, 0x01, 0x40, 0x01, 0x40, 0x02, 0x04,
+    0x10, 0x00, 0x10, 0x80, 0x42, 0x20, 0x01, 0x08, 0x00, 0x21, 0x00, 0x10,
+    0x00, 0x84, 0x10, 0x1c, 0x13, 0x00, 0xb2, 0x30
+  }
+};
@@ -1,6 +1,9 @@
 /*
+ * GENERATED by 8bit/generate_tables.py from the MicroPython sources.
+ * DO NOT EDIT.  Re-run the generator instead.
+ *
  * Copyright (C) 2020 Gregory P. Smith (@gpshead).
- * 
+ *
  * Released under the Apache 2.0 license.
  * https://www.apache.org/licenses/
  */
@@ -12,9 +15,26 @@
 
 #define NUM_DISC_LEDS 255
 #define NUM_DISC_RINGS 10
-#define MAX_DISC_NEIGHBORS 6
+
+// Bit n set if a live cell with n live neighbors stays alive.
+#define LIFE_STAY_ALIVE_MASK 0x0c
+// Bit n set if a dead cell with n live neighbors comes to life.
+#define LIFE_NEW_BORN_MASK 0x24
+#define NEIGHBORS_SUPPORT_LIFE(num_alive) ((LIFE_STAY_ALIVE_MASK >> (num_alive)) & 1)
+#define NEIGHBORS_SPAWN_LIFE(num_alive) ((LIFE_NEW_BORN_MASK >> (num_alive)) & 1)
+
+// Neighbor codes: low nibble describes the run of neighbors in the outer
+// ring, high nibble the inner ring.  Bits 0-1 of a nibble are the run
+// length, bits 2-3 how far its start moved since the previous LED.
+#define NEIGHBOR_RUN_LENGTH(nibble) ((nibble) & 0x3)
+#define NEIGHBOR_RUN_DELTA(nibble) ((nibble) >> 2)
+
+// Seed patterns are bitsets: LED n is alive if bit n%8 of byte n/8 is set.
+#define NUM_SEED_PATTERNS 5
+#define SEED_PATTERN_BYTES 32
 
 extern const uint8_t PROGMEM kDiscRings[NUM_DISC_RINGS];
-extern const uint8_t PROGMEM kDiscNeighbors[NUM_DISC_LEDS][MAX_DISC_NEIGHBORS];
+extern const uint8_t PROGMEM kDiscNeighborCodes[NUM_DISC_LEDS];
+extern const uint8_t PROGMEM kSeedPatterns[NUM_SEED_PATTERNS][SEED_PATTERN_BYTES];
 
-#endif  // _LED_DISC_CONFIG_H_
\ No newline at end of file
+#endif  // _LED_DISC_CONFIG_H_
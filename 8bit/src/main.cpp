@@ -30,15 +30,8 @@
 #define LIFE_STATE_BYTES ((NUM_DISC_LEDS+(CULTURES_PER_BYTE-1)) / CULTURES_PER_BYTE)
 #define MS_BETWEEN_FRAMES 324
 
-#define NEIGHBORS_SUPPORT_LIFE(num_alive) ((num_alive) == 2 || (num_alive) == 3)
-// Classic grid based Life uses (num_alive) == 3 for spawning; not pretty on our 3-6 neighbor circle.
-#define NEIGHBORS_SPAWN_LIFE(num_alive) ((num_alive) == 2 || (num_alive) == 5)
-
-// I randomly chose these, this particular start sequence does end
-// up living as it quickly results in a circle of life at the center
-// with plenty of exterior activity resulting in new births for a
-// nice animation.
-const uint8_t PROGMEM kStartingState[] = "\x01\x05\t\n\x0b\x0c\r\x0e\x0f:;<=>?@\xc8\xc9\xca\xcb\xd1\xf0\xf1\xf2\xf3\xf5\xfe\xfd\xfc\xfb";
+// The LIFE rules, neighbor topology and seed patterns are generated into
+// led_disc_config.{h,cpp} by ../generate_tables.py.
 
 uint8_t state_a[LIFE_STATE_BYTES];
 uint8_t state_b[LIFE_STATE_BYTES];
@@ -47,9 +40,9 @@ uint8_t *next_state = state_b;
 
 // Function prototypes.
 
-void culture_life_once(void);
+uint8_t culture_life_once(void);
 void refresh_display(void);
-void load_starting_state(void);
+void load_seed_pattern(const uint8_t pattern);
 void self_test_pattern(void);
 
 // Arduino entrypoints.
@@ -62,13 +55,20 @@ void setup() {
   self_test_pattern();
   delay(MS_BETWEEN_FRAMES*10);
 
-  load_starting_state();
+  load_seed_pattern(0);
 }
 
+uint8_t seed_pattern = 0;
+
 void loop() {
   refresh_display();
   delay(MS_BETWEEN_FRAMES);
-  culture_life_once();
+  if (!culture_life_once()) {  // all dead, restart.
+    refresh_display();
+    delay(MS_BETWEEN_FRAMES*3);
+    if (++seed_pattern >= NUM_SEED_PATTERNS) seed_pattern = 0;
+    load_seed_pattern(seed_pattern);
+  }
 }
 
 // Testing.
@@ -102,14 +102,18 @@ static void set_culture_value(uint8_t *state, const uint8_t idx, const uint8_t v
   state[data_idx] = (state[data_idx] & mask_out) | new_bits;
 }
 
-void load_starting_state(void) {
-  const uint8_t *led_k = kStartingState;
-  uint8_t led;
-  do {
-    led = pgm_read_byte(led_k++);
-    if (led == 0) break;
-    set_culture_value(current_state, led, 1);
-  } while (1);
+void load_seed_pattern(const uint8_t pattern) {
+  const uint8_t *bitset = kSeedPatterns[pattern];
+  uint8_t led = 0;
+  for (uint8_t idx = 0; idx < SEED_PATTERN_BYTES; ++idx) {
+    uint8_t bits = pgm_read_byte(&bitset[idx]);
+    for (uint8_t bit = 0; bit < 8; ++bit, ++led) {
+      if (bits & 1) {
+        set_culture_value(current_state, led, 1);
+      }
+      bits >>= 1;
+    }
+  }
 }
 
 void refresh_display(void) {
@@ -127,31 +131,71 @@ static void swap_life_states(void) {
   next_state = tmp;
 }
 
-void culture_life_once(void) {
+// Counts the live cells in a run of count LEDs starting at pos (which may
+// have wrapped past the end) within a ring.
+static uint8_t count_alive_run(const uint8_t ring_start, const uint8_t ring_size,
+                               uint8_t pos, uint8_t count) {
+  uint8_t alive = 0;
+  for (; count; --count, ++pos) {
+    if (pos >= ring_size) pos -= ring_size;
+    if (get_culture_value(current_state, ring_start + pos)) ++alive;
+  }
+  return alive;
+}
+
+// Returns the number of LEDs alive in the new generation.
+uint8_t culture_life_once(void) {
   memcpy(next_state, current_state, LIFE_STATE_BYTES);
-  for (uint8_t led=0; led < NUM_DISC_LEDS; ++led) {
-    uint8_t live_neighbors = 0;
-    for (uint8_t idx = 0; idx < MAX_DISC_NEIGHBORS; ++idx) {
-      uint8_t neighbor = pgm_read_byte(&kDiscNeighbors[led][idx]);
-      if (neighbor == 255) break;  // end of short list.
-      if (get_culture_value(current_state, neighbor)) {
-        ++live_neighbors;
-      }
-    }
-    const uint8_t current_value = get_culture_value(next_state, led);
-    if (current_value) {  // currently alive
-      if (NEIGHBORS_SUPPORT_LIFE(live_neighbors)) {  // age
-        if (current_value < MAX_CULTURE_VALUE) {
-          set_culture_value(next_state, led, current_value + 1);
-        }
+  uint8_t num_alive = 0;
+  uint8_t led = 0;
+  uint8_t outer_start = 0, outer_size = 0;
+  for (uint8_t ring = 0; ring < NUM_DISC_RINGS; ++ring) {
+    const uint8_t ring_start = led;
+    const uint8_t ring_size = pgm_read_byte(&kDiscRings[ring]);
+    const uint8_t inner_start = ring_start + ring_size;
+    const uint8_t inner_size = (ring + 1 < NUM_DISC_RINGS) ?
+        pgm_read_byte(&kDiscRings[ring + 1]) : 0;
+    // Start of this LED's run of neighbors in the outer & inner rings.
+    uint8_t outer_pos = 0, inner_pos = 0;
+    for (uint8_t pos = 0; pos < ring_size; ++pos, ++led) {
+      uint8_t live_neighbors;
+      if (ring_size == 1) {  // The center neighbors its entire outer ring.
+        live_neighbors = count_alive_run(outer_start, outer_size, 0, outer_size);
       } else {
-        set_culture_value(next_state, led, 0);  // death
+        // Our siblings on either side in this ring.
+        live_neighbors = count_alive_run(
+            ring_start, ring_size, pos ? pos - 1 : ring_size - 1, 1);
+        live_neighbors += count_alive_run(ring_start, ring_size, pos + 1, 1);
+        const uint8_t code = pgm_read_byte(&kDiscNeighborCodes[led]);
+        const uint8_t outer = code & 0xf;
+        const uint8_t inner = code >> 4;
+        outer_pos += NEIGHBOR_RUN_DELTA(outer);
+        inner_pos += NEIGHBOR_RUN_DELTA(inner);
+        live_neighbors += count_alive_run(outer_start, outer_size, outer_pos,
+                                          NEIGHBOR_RUN_LENGTH(outer));
+        live_neighbors += count_alive_run(inner_start, inner_size, inner_pos,
+                                          NEIGHBOR_RUN_LENGTH(inner));
       }
-    } else {  // currently dead
-      if (NEIGHBORS_SPAWN_LIFE(live_neighbors)) {
-        set_culture_value(next_state, led, 1);  // creation
+      const uint8_t current_value = get_culture_value(next_state, led);
+      if (current_value) {  // currently alive
+        if (NEIGHBORS_SUPPORT_LIFE(live_neighbors)) {  // age
+          ++num_alive;
+          if (current_value < MAX_CULTURE_VALUE) {
+            set_culture_value(next_state, led, current_value + 1);
+          }
+        } else {
+          set_culture_value(next_state, led, 0);  // death
+        }
+      } else {  // currently dead
+        if (NEIGHBORS_SPAWN_LIFE(live_neighbors)) {
+          ++num_alive;
+          set_culture_value(next_state, led, 1);  // creation
+        }
       }
     }
+    outer_start = ring_start;
+    outer_size = ring_size;
   }
   swap_life_states();
-}
\ No newline at end of file
+  return num_alive;
+}
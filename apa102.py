@@ -4,7 +4,12 @@
 # Released under the Apache 2.0 license.
 # http://www.apache.org/licenses/
 
-import time
+import scheduler
+
+try:
+  import viper_kernels
+except (ImportError, SyntaxError):  # CPython or no native emitter.
+  viper_kernels = None
 
 # This needs to be sent once at the start.
 START_FRAME = b'\x00\x00\x00\x00'
@@ -89,31 +94,72 @@ def test(led_data=b'', *, num_leds=0, sleep_ms=9, rotate=1):
     sleep_ms: time to sleep between updates.
     rotate: The number of leds to rotate by on each iteration.
   """
-  if len(led_data) % 4:
-    raise ValueError("led_data length must be a multiple of 4")
+  scheduler.run_frames(_test_frames(led_data, num_leds, rotate), sleep_ms)
+
+
+async def test_async(led_data=b'', *, num_leds=0, sleep_ms=9, rotate=1):
+  """Coroutine version of test()."""
+  await scheduler.run_frames_async(
+      _test_frames(led_data, num_leds, rotate), sleep_ms)
+
+
+def _test_frames(led_data, num_leds, rotate):
+  """Generator behind test(), yields after each frame is written."""
+  return _written(_test_buffers(led_data, num_leds, rotate))
+
+
+def _write(data):
+  num_written = spi.write(data)
+  if num_written != len(data):
+    print("SPI write returned", num_written, "not", len(data))
+
+
+def _written(buffers):
+  """Writes bus buffers to SPI, yielding between frames.
+
+  The next buffer is computed before yielding so that after the wait
+  only the write remains.  Nothing is yielded after the last frame.
+  """
   if not spi: init()
+  for data in buffers:
+    _write(data)
+    break
+  for data in buffers:
+    yield
+    _write(data)
+
+
+def _bus_data(led_data, num_leds):
+  """Returns a bytearray for a whole bus write of led_data.
+
+  The start frame and finish bytes are included and the bus is padded
+  with led_off values up to num_leds.
+  """
   num_leds = _default_num_leds(num_leds)
   given_leds = len(led_data)//4
   if given_leds < num_leds:
     missing_leds = num_leds - given_leds
     led_data += led_off*missing_leds
     print('Turning remaining', missing_leds, 'of', num_leds, 'off.')
-  end_bytes = FINISH_BYTE * num_finish_bytes(num_leds)
-  test_data = bytearray(START_FRAME + led_data + end_bytes)
-  expected_len = len(test_data)
+  return bytearray(START_FRAME + led_data +
+                   FINISH_BYTE * num_finish_bytes(num_leds))
+
+
+def _test_buffers(led_data, num_leds, rotate):
+  """Yields the bus data for each frame of test(), modified in place."""
+  if len(led_data) % 4:
+    raise ValueError("led_data length must be a multiple of 4")
+  test_data = _bus_data(led_data, num_leds)
   rotate_start = len(START_FRAME)
-  rotate_end = rotate_start + len(led_data)
-  if len(led_data) > 4:
+  rotate_end = len(test_data) - num_finish_bytes(_default_num_leds(num_leds))
+  if rotate_end - rotate_start > 4:
     rotate_size = rotate*4
   else:
     rotate_size = 0
   while True:
-    num_written = spi.write(test_data)
-    if num_written != expected_len:
-      print("SPI write returned", num_written, "not", expected_len)
+    yield test_data
     if not rotate_size:
       break
-    time.sleep_ms(sleep_ms)
     if rotate_size > 0:
         test_data[rotate_start:rotate_end] = (
             test_data[rotate_start+rotate_size:rotate_end] +
@@ -124,12 +170,37 @@ def test(led_data=b'', *, num_leds=0, sleep_ms=9, rotate=1):
             test_data[rotate_start:rotate_end+rotate_size])
 
 
+def _rotation_period(led_data, num_leds, rotate):
+  """(buffers, num_frames, skip) for one period of test() output."""
+  total_leds = max(len(led_data)//4, _default_num_leds(num_leds))
+  num_frames = 1
+  if rotate and total_leds > 1:
+    num_frames = total_leds // _gcd(total_leds, abs(rotate))
+  return _test_buffers(led_data, num_leds, rotate), num_frames, 0
+
+
+def _gcd(a: int, b: int) -> int:
+  while b:
+    a, b = b, a % b
+  return a
+
+
+def _color_chase_data():
+  white = b'\xff\x10\x10\x10'
+  red = b'\xff\x00\x00\x70'
+  return (white+six_leds+red+led_off*19)*4
+
+
 def color_chase(num_leds=0):
   """A colorful chase sequence."""
   num_leds = _default_num_leds(num_leds)
-  white = b'\xff\x10\x10\x10'
-  red = b'\xff\x00\x00\x70'
-  test((white+six_leds+red+led_off*19)*4, sleep_ms=33, num_leds=num_leds)
+  test(_color_chase_data(), sleep_ms=33, num_leds=num_leds)
+
+
+async def color_chase_async(num_leds=0):
+  """Coroutine version of color_chase()."""
+  num_leds = _default_num_leds(num_leds)
+  await test_async(_color_chase_data(), sleep_ms=33, num_leds=num_leds)
 
 
 _5bit_lsz = bytes((
@@ -160,7 +231,7 @@ _bright_shift = bytes((
   0, 0, 0, 0, # 24-27
   0, 0, 0, 0, # 28-31
 ))
-def _inplace_normalize_led(led_data: bytearray, offset: int, brightness: int):
+def _py_inplace_normalize_led(led_data: bytearray, offset: int, brightness: int):
   """Prefer using high freq PWM LED values rather than low freq PWM brightness.
 
   Args:
@@ -186,6 +257,20 @@ def _inplace_normalize_led(led_data: bytearray, offset: int, brightness: int):
   return brightness
 
 
+_normalize_tables = _5bit_lsz + _bright_shift
+
+
+def _viper_inplace_normalize_led(led_data: bytearray, offset: int, brightness: int):
+  return viper_kernels.normalize_led(led_data, offset, brightness,
+                                     _normalize_tables)
+
+
+if viper_kernels:
+  _inplace_normalize_led = _viper_inplace_normalize_led
+else:
+  _inplace_normalize_led = _py_inplace_normalize_led
+
+
 def _brightness(color, brightness: int):
   color = bytearray(color)
   brightness = _inplace_normalize_led(color, 1, brightness)
@@ -194,21 +279,32 @@ def _brightness(color, brightness: int):
   return bytes(color)
 
 
-def target(brightness=2, *, offset=0, sleep_ms=16, rotate=0):
-  """Display a concentric rainbow on an LED disc at the given bus offset."""
+def _target_data(brightness, offset):
   assert 0 < brightness <= 31, 'brightness must be 1-31'
   order = [_brightness(c, brightness) for c in rainbow]
   led_list = [led_off*offset]
   for size, color in zip(DISC_RINGS, order):
     led_list.append(size*color)
   led_list.append(led_off*NUM_STRAND_LEDS)
+  return b''.join(led_list)
+
 
-  test(b''.join(led_list),
+def target(brightness=2, *, offset=0, sleep_ms=16, rotate=0):
+  """Display a concentric rainbow on an LED disc at the given bus offset."""
+  test(_target_data(brightness, offset),
        num_leds=NUM_DISC_LEDS+offset,
        sleep_ms=sleep_ms,
        rotate=rotate)
 
 
+async def target_async(brightness=2, *, offset=0, sleep_ms=16, rotate=0):
+  """Coroutine version of target()."""
+  await test_async(_target_data(brightness, offset),
+                   num_leds=NUM_DISC_LEDS+offset,
+                   sleep_ms=sleep_ms,
+                   rotate=rotate)
+
+
 def repeating_values(values):
   while True:
     yield from values
@@ -217,19 +313,36 @@ def repeating_values(values):
 def _set_disc_ring(led_data:bytearray, ring_no:int, colors:tuple, bus_offset:int):
   for color_value in colors:
     assert len(color_value) == 4
-  start = bus_offset + DISC_RING_OFFSETS[ring_no]
-  end = start + DISC_RINGS[ring_no]
-  color = repeating_values(colors)
-  for idx in range(start*4, end*4, 4):
-    led_data[idx:idx+4] = next(color)
+  start = (bus_offset + DISC_RING_OFFSETS[ring_no])*4
+  size = DISC_RINGS[ring_no]*4
+  pattern = b''.join(colors)
+  led_data[start:start+size] = (pattern*(size//len(pattern)+1))[:size]
 
 
 def puddle(brightness=3, *, offset=0, num_leds=0, sleep_ms=40):
   """Simple attempt to create a rippling puddle effect on a disc."""
+  scheduler.run_frames(_puddle_frames(brightness, offset, num_leds), sleep_ms)
+
+
+async def puddle_async(brightness=3, *, offset=0, num_leds=0, sleep_ms=40):
+  """Coroutine version of puddle()."""
+  await scheduler.run_frames_async(
+      _puddle_frames(brightness, offset, num_leds), sleep_ms)
+
+
+def _puddle_frames(brightness, offset, num_leds):
+  return _written(_puddle_buffers(brightness, offset, num_leds))
+
+
+_PUDDLE_COLORS = (cyan, blue, indigo, violet, white)
+
+
+def _puddle_buffers(brightness, offset, num_leds):
   assert 0 < brightness <= 31, 'brightness must be 1-31'
-  num_leds = _default_num_leds(num_leds)
-  led_data = bytearray(led_off*offset + cyan*NUM_DISC_LEDS + led_off*offset)
-  raw_colors = tuple(_brightness(c, brightness) for c in (cyan, blue, indigo, violet, white))
+  bus_data = _bus_data(led_off*offset + cyan*NUM_DISC_LEDS + led_off*offset,
+                       num_leds)
+  led_data = memoryview(bus_data)[len(START_FRAME):]
+  raw_colors = tuple(_brightness(c, brightness) for c in _PUDDLE_COLORS)
   color = repeating_values(raw_colors)
   ring = repeating_values(tuple(range(NUM_RINGS)))
   prev_color = next(color)
@@ -239,32 +352,54 @@ def puddle(brightness=3, *, offset=0, num_leds=0, sleep_ms=40):
     #_set_disc_ring(led_data, next(ring), (prev_color, new_color, new_color), offset)
     _set_disc_ring(led_data, next(ring), (new_color,), offset)
     prev_color = new_color
-    test(led_data, num_leds=num_leds, rotate=0)
-    time.sleep_ms(sleep_ms)
+    yield bus_data
     ring_no += 1
     if ring_no >= NUM_RINGS:
       next(color)
       ring_no = 0
 
 
+def _puddle_period(brightness=3, *, offset=0, num_leds=0):
+  # Every ring has been painted by the end of the first pass.  Each pass
+  # skips one extra color so the colors line up again after one pass
+  # per color.
+  return (_puddle_buffers(brightness, offset, num_leds),
+          NUM_RINGS*len(_PUDDLE_COLORS), NUM_RINGS-1)
+
+
 def cylon(*, start=0, end=0, colors=(b'\xff\x22\x33\x40',), sleep_ms=250,
           verbose=False):
   """All this has happened before and all this will happen again."""
+  scheduler.run_frames(_cylon_frames(start, end, colors, verbose), sleep_ms)
+
+
+async def cylon_async(*, start=0, end=0, colors=(b'\xff\x22\x33\x40',),
+                      sleep_ms=250, verbose=False):
+  """Coroutine version of cylon()."""
+  await scheduler.run_frames_async(
+      _cylon_frames(start, end, colors, verbose), sleep_ms)
+
+
+def _cylon_frames(start, end, colors, verbose):
+  return _written(_cylon_buffers(start, end, colors, verbose))
+
+
+def _cylon_buffers(start, end, colors, verbose):
   assert len(colors) in (1,2), 'only 1 or 2 colors allowed'
   end = _default_num_leds(end)
   byte_end = end*4
   byte_start = start*4
   direction = 4
   pos = byte_start
-  led_data = bytearray(led_off*end)
+  bus_data = _bus_data(led_off*end, end)
+  led_data = memoryview(bus_data)[len(START_FRAME):]
   while True:
     led_data[pos:pos+4] = colors[0]
     if len(colors) > 1:
       led_data[byte_end-pos-4:byte_end-pos] = colors[1]
-    test(led_data, num_leds=end, rotate=0)
     if verbose:
       print('LED #', pos//4)
-    time.sleep_ms(sleep_ms)
+    yield bus_data
     led_data[pos:pos+4] = led_off
     if len(colors) > 1:
       led_data[byte_end-pos-4:byte_end-pos] = led_off
@@ -273,3 +408,51 @@ def cylon(*, start=0, end=0, colors=(b'\xff\x22\x33\x40',), sleep_ms=250,
       direction = -direction
       pos += direction*2  # Undo and go back.
 
+
+def _cylon_period(*, start=0, end=0, colors=(b'\xff\x22\x33\x40',)):
+  num_leds = _default_num_leds(end) - start
+  return (_cylon_buffers(start, end, colors, False),
+          max(1, 2*num_leds - 2), 0)
+
+
+def _target_period(brightness=2, *, offset=0, rotate=0):
+  return _rotation_period(_target_data(brightness, offset),
+                          NUM_DISC_LEDS+offset, rotate)
+
+
+def _color_chase_period(num_leds=0):
+  return _rotation_period(_color_chase_data(), num_leds, 1)
+
+
+_EFFECT_PERIODS = {
+    'color_chase': _color_chase_period,
+    'cylon': _cylon_period,
+    'puddle': _puddle_period,
+    'target': _target_period,
+}
+
+
+def compile_effect(effect: str, **kwargs):
+  """Render one period of a repeating effect into a frametable.FrameTable.
+
+  Playing the table back with play() writes precomputed frames with no
+  per frame math or allocation.  A 255 LED frame is 1039 bytes; tables
+  too large for RAM can be saved, even from a PC, and played from flash.
+
+  Args:
+    effect: 'color_chase', 'cylon', 'puddle' or 'target'.
+    kwargs: The effect function's arguments, other than sleep_ms.
+  """
+  import frametable
+  buffers, num_frames, skip = _EFFECT_PERIODS[effect](**kwargs)
+  return frametable.FrameTable.compile(buffers, num_frames, skip=skip)
+
+
+def play(table, *, sleep_ms=40, repeat=True):
+  """Play a compile_effect() table.  Loops forever unless repeat=False."""
+  scheduler.run_frames(_written(table.frames(repeat)), sleep_ms)
+
+
+async def play_async(table, *, sleep_ms=40, repeat=True):
+  """Coroutine version of play()."""
+  await scheduler.run_frames_async(_written(table.frames(repeat)), sleep_ms)
@@ -0,0 +1,149 @@
+# MicroPython python3
+# vim: set sw=2 ai expandtab
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Precomputed frames of repeating LED effects.
+
+A FrameTable holds one period of an effect as complete bus writes, start
+frame and finish bytes included, back to back in one buffer.  Playback
+hands zero-copy memoryview slices of it straight to SPI.  See
+apa102.compile_effect() and apa102.play().
+
+Tables can be saved to flash and played from there a frame at a time
+through a single reusable buffer.  File format, all little endian:
+
+  header: b'LCFT', u8 version, u8 reserved, u16 frame count,
+          u32 frame size
+  frame count frames of frame size bytes each.
+"""
+
+try:
+  import ustruct as struct
+except ImportError:
+  import struct
+
+MAGIC = b'LCFT'
+VERSION = 1
+_HEADER = '<4sBxHI'
+_HEADER_SIZE = 12
+
+
+def _unpack_header(header) -> tuple:
+  if len(header) < _HEADER_SIZE:
+    raise ValueError('truncated frame table')
+  magic, version, num_frames, frame_size = struct.unpack_from(_HEADER, header, 0)
+  if magic != MAGIC or version != VERSION or not frame_size:
+    raise ValueError('not a version %d frame table' % VERSION)
+  return num_frames, frame_size
+
+
+class FrameTable(object):
+  def __init__(self, data, frame_size: int):
+    """A frame table backed by data holding frames of frame_size bytes."""
+    if not frame_size or len(data) % frame_size:
+      raise ValueError('data is not a whole number of frames')
+    self._data = memoryview(data)
+    self.frame_size = frame_size
+
+  @classmethod
+  def compile(cls, buffers, num_frames: int, skip: int = 0):
+    """Records num_frames frames from a generator of bus writes.
+
+    Args:
+      buffers: Yields each frame's bytes; it may reuse one buffer.
+      num_frames: How many frames to record, normally one period.
+      skip: Frames to discard first, such as a startup transient.
+    """
+    try:
+      for _ in range(skip):
+        next(buffers)
+      first = next(buffers)
+      frame_size = len(first)
+      table = bytearray(frame_size*num_frames)
+      table[:frame_size] = first
+      for offset in range(frame_size, len(table), frame_size):
+        data = next(buffers)
+        if len(data) != frame_size:
+          raise ValueError('frame size changed mid effect')
+        table[offset:offset+frame_size] = data
+    except StopIteration:
+      raise ValueError('effect ended before %d frames' % num_frames)
+    return cls(table, frame_size)
+
+  @classmethod
+  def load(cls, path):
+    """Reads a saved frame table entirely into RAM."""
+    with open(path, 'rb') as table_file:
+      data = table_file.read()
+    num_frames, frame_size = _unpack_header(data)
+    if len(data) < _HEADER_SIZE + num_frames*frame_size:
+      raise ValueError('truncated frame table')
+    return cls(memoryview(data)[_HEADER_SIZE:_HEADER_SIZE+num_frames*frame_size],
+               frame_size)
+
+  def save(self, path):
+    with open(path, 'wb') as table_file:
+      table_file.write(struct.pack(_HEADER, MAGIC, VERSION, len(self),
+                                   self.frame_size))
+      table_file.write(self._data)
+
+  def __len__(self):
+    return len(self._data) // self.frame_size
+
+  def frame(self, idx: int):
+    """A zero-copy memoryview of frame idx."""
+    if not 0 <= idx < len(self):
+      raise IndexError(idx)
+    offset = idx*self.frame_size
+    return self._data[offset:offset+self.frame_size]
+
+  def frames(self, repeat=True):
+    """Yields each frame in order, forever unless repeat is False."""
+    data = self._data
+    size = self.frame_size
+    while True:
+      for offset in range(0, len(data), size):
+        yield data[offset:offset+size]
+      if not repeat:
+        return
+
+
+class FileFrameTable(object):
+  def __init__(self, path):
+    """A saved frame table played from flash rather than RAM.
+
+    Only one frame is held in RAM.  frame() and frames() return that
+    buffer, so each value is only valid until the next frame is read.
+    """
+    self._file = open(path, 'rb')
+    self._num_frames, self.frame_size = _unpack_header(
+        self._file.read(_HEADER_SIZE))
+    self._buffer = bytearray(self.frame_size)
+
+  def close(self):
+    self._file.close()
+
+  def __len__(self):
+    return self._num_frames
+
+  def _read(self):
+    if self._file.readinto(self._buffer) != self.frame_size:
+      raise ValueError('truncated frame table')
+    return self._buffer
+
+  def frame(self, idx: int):
+    if not 0 <= idx < self._num_frames:
+      raise IndexError(idx)
+    self._file.seek(_HEADER_SIZE + idx*self.frame_size)
+    return self._read()
+
+  def frames(self, repeat=True):
+    """Yields each frame in order, forever unless repeat is False."""
+    while True:
+      self._file.seek(_HEADER_SIZE)
+      for _ in range(self._num_frames):
+        yield self._read()
+      if not repeat:
+        return
@@ -4,13 +4,20 @@
 # Released under the Apache 2.0 license.
 # http://www.apache.org/licenses/
 
-import os
 import sys
 import time
 
 import apa102
+import reseed
+import scheduler
+import stats
 from apa102 import DISC_RINGS, NUM_DISC_LEDS, NUM_RINGS, DISC_RING_OFFSETS
 
+try:
+  import viper_kernels
+except (ImportError, SyntaxError):  # CPython or no native emitter.
+  viper_kernels = None
+
 orig = [apa102.cyan, apa102.blue, apa102.indigo, apa102.violet,
         apa102.orange, apa102.red, apa102.white]
 xmas = [b'\xff\x04 \x00', b'\xff\x04\x00 ', b'\xff\x00\x80\x00',
@@ -26,7 +33,8 @@ class Life(object):
                brightness=0x04,
                bus_len=NUM_DISC_LEDS,
                bus_offset=0,
-               stats_display=None):
+               stats_display=None,
+               reseeder=None):
     """Create a LIFE simulation mapped to an Adafruit circle of LED.
 
     Args:
@@ -35,9 +43,13 @@ class Life(object):
       offset: The bus offset of the start of the LED disc.
       stats_display: An optional instance of a class that will receive
           information as our simulation runs.
+      reseeder: A reseed.Reseeder used to bring new life after a dieoff.
+          Pass one with a fixed seed for a reproducible run.
     """
     self.brightness = brightness
     self.stats_display = stats_display
+    self.stats = stats.LifeStats()
+    self.reseeder = reseeder or reseed.Reseeder()
     self.bus_len = bus_len
     self.bus_offset = bus_offset
     if apa102.spi:
@@ -70,9 +82,11 @@ class Life(object):
       self.shape = 'torus'
       self._neighbors = list(self._neighbors)
       for outer_led in range(DISC_RINGS[0]):
-        self._neighbors[outer_led] += b'\xfe'  # Inner dot is a neighbor.
+        # Inner dot is a neighbor.
+        self._neighbors[outer_led] = bytes(self._neighbors[outer_led]) + b'\xfe'
       # Entire outer ring is a neighbor of the inner dot.
-      self._neighbors[0xfe] += bytes(range(DISC_RINGS[0]))
+      self._neighbors[0xfe] = (bytes(self._neighbors[0xfe])
+                               + bytes(range(DISC_RINGS[0])))
 
 
   def run_classic(self, *args, **kwargs):
@@ -80,7 +94,8 @@ class Life(object):
 
 
   def run(self, initial_state=(), *, alive=orig,
-          sleep_ms=50, iterations=-1, stay_alive=(2,3), new_born=(2,5)):
+          sleep_ms=50, iterations=-1, stay_alive=(2,3), new_born=(2,5),
+          sectors=1, processes=False):
     """Classic life tunable using stay_alive and newborn sets.
 
     Args:
@@ -90,101 +105,202 @@ class Life(object):
       iterations: if > 0, the number of iterations to go through.
       stay_alive: LIFE - Number of neighbors required for a pixel to live.
       new_born: LIFE - Number of neighbors for new life on a dead pixel.
+      sectors: Step generations in this many parallel sectors, see
+          generations().
+      processes: Use processes rather than threads for the sectors.
 
     Returns:
       The final state after running through all iterations.
     """
-    assert len(alive)
+    renderer = self._start_stats()
+    steps = self._run_steps(initial_state, alive, sleep_ms, iterations,
+                            stay_alive, new_born, sectors, processes)
+    pacer = scheduler.FrameScheduler(sleep_ms)
+    pacer.start()
+    try:
+      while True:
+        pause_ms = next(steps)
+        renderer.render(self.stats, pacer.remaining_ms() + pause_ms)
+        pacer.wait_blocking()
+        if pause_ms:
+          scheduler.sleep_ms(pause_ms)
+          pacer.start()
+    except StopIteration as e:
+      return e.value
+
+
+  async def run_async(self, initial_state=(), *, alive=orig,
+                      sleep_ms=50, iterations=-1, stay_alive=(2,3),
+                      new_born=(2,5), sectors=1, processes=False):
+    """Coroutine version of run() for use with (u)asyncio.
+
+    Frames are paced to a steady deadline and other tasks get to run in
+    the time between computing a generation and displaying it.
+    """
+    renderer = self._start_stats()
+    steps = self._run_steps(initial_state, alive, sleep_ms, iterations,
+                            stay_alive, new_born, sectors, processes)
+    pacer = scheduler.FrameScheduler(sleep_ms)
+    pacer.start()
+    try:
+      while True:
+        pause_ms = next(steps)
+        renderer.render(self.stats, pacer.remaining_ms() + pause_ms)
+        await pacer.wait()
+        if pause_ms:
+          await scheduler.async_sleep_ms(pause_ms)
+          pacer.start()
+    except StopIteration as e:
+      return e.value
+
+
+  def _start_stats(self):
+    """Resets self.stats and returns a renderer for self.stats_display."""
+    self.stats = stats.LifeStats()
+    renderer = stats.StatsRenderer(self.stats_display)
+    renderer.start()
+    return renderer
+
+
+  def generations(self, initial_state=(), *, stay_alive=(2,3),
+                  new_born=(2,5), max_alive=1, reuse=False, sectors=1,
+                  processes=False):
+    """Lazily yields each generation, starting with initial_state.
+
+    Nothing is displayed or paced and it never ends.  Stages such as
+    detect_cycles(), record() and displayed() can be chained onto it.
+    Changes made in place to a yielded state, such as a reseed, carry
+    forward into the following generations.
+
+    Args:
+      initial_state: is a sequence of the [0,254] LEDs alive at the start.
+      stay_alive: LIFE - Number of neighbors required for a pixel to live.
+      new_born: LIFE - Number of neighbors for new life on a dead pixel.
+      max_alive: The age at which a pixel stops getting older.
+      reuse: Alternate between two buffers rather than allocating each
+          generation.  A yielded state is then overwritten two
+          generations later; copy it to keep it.
+      sectors: If > 1, step the topology split into this many sectors in
+          parallel with parallel.ParallelLife.  CPython only, and worth
+          it for large topologies such as chained discs.
+      processes: Use processes rather than threads for the sectors.
+    """
     if not initial_state:
       initial_state = self._default_start_state
-    current_state = bytearray(NUM_DISC_LEDS)  # wasteful
+    if sectors > 1:
+      yield from self._parallel_generations(
+          initial_state, stay_alive, new_born, max_alive, reuse, sectors,
+          processes)
+      return
+    current_state = bytearray(len(self._neighbors))
     for led in initial_state:
       current_state[led] = 1
-    start_state = current_state
-    colormap = {0: apa102._brightness(apa102.led_off, self.brightness)}
-    for idx, color in enumerate(alive, 1):
-      assert len(color) == 4
-      colormap[idx] = apa102._brightness(color, self.brightness)
-    max_alive = len(alive)
-
-    count_dieoffs = 0
-    count_iters = 0
-    ticks_ms_refresh = 0
-    if self.stats_display:
-      self.stats_display.clear()
-      self.stats_display.set_cursor(0,0)
-      self.stats_display.write(' Rounds alive: 0\n')
-      self.stats_display.write('Cyclic states: 0\n')  # Unimplemented.
-      self.stats_display.write('Total dieoffs: 0')
-
-    while iterations != 0:
-      # Display the current state.
-      start_ms = time.ticks_ms()
-      self._display_state(current_state, colormap)
-      if self.stats_display and time.ticks_ms() - ticks_ms_refresh > 1000:
-        ticks_ms_refresh = time.ticks_ms()
-        self.stats_display.set_text_cursor(15,0)
-        self.stats_display.write(str(count_iters))
-        try:
-            self.stats_display.display()
-        except Exception:
-            # Error updating, nothing we can do about it.
-            self.stats_display = None
-      count_iters += 1
-      wait_until = start_ms + sleep_ms
-      now = time.ticks_ms()
-      while now < wait_until:
-        if wait_until - now > 10:
-          time.sleep_ms(10)
+    spare_state = bytearray(len(current_state)) if reuse else None
+    neighbors = self._neighbors
+    while True:
+      yield current_state
+      if reuse:
+        next_generation_into(neighbors, current_state, spare_state,
+                             stay_alive, new_born, max_alive)
+        current_state, spare_state = spare_state, current_state
+      else:
+        current_state = next_generation(neighbors, current_state,
+                                        stay_alive, new_born, max_alive)
+
+
+  def _parallel_generations(self, initial_state, stay_alive, new_born,
+                            max_alive, reuse, sectors, processes):
+    import parallel  # Uses threading, so only when asked for.
+    engine = parallel.ParallelLife(
+        self._neighbors, sectors, processes=processes, stay_alive=stay_alive,
+        new_born=new_born, max_alive=max_alive)
+    states = engine.generations(initial_state)
+    try:
+      for state in states:
+        if reuse:
+          yield state
         else:
-          time.sleep_ms(1)
-        now = time.ticks_ms()
-
-      # all dead, restart.
-      if (max(current_state) == 0):
-        count_dieoffs += 1
-        if self.stats_display:
-          self.stats_display.set_text_cursor(15,0)
-          self.stats_display.write(str(count_iters))
-          self.stats_display.set_text_cursor(15,2)
-          self.stats_display.write(str(count_dieoffs))
-          self.stats_display.display()
-        time.sleep_ms(1000+sleep_ms*3)  # pause
-        # Randomly seed new life.
-        for led in os.urandom(23):
-          if led < len(current_state):
-            current_state[led] = not current_state[led]
-
-      # Compute the next iteration.
-      next_state = bytearray(current_state)  # copy
-      for led, alive in enumerate(current_state):
-        live_neighbors = 0
-        for neighbor in self._neighbors[led]:
-          if current_state[neighbor]:
-            live_neighbors += 1
-        live_neighbors %= 7  # HACK, for torus to be meaningful.
-        if alive:
-          if live_neighbors in stay_alive:
-            next_state[led] = min(next_state[led]+1, max_alive)
-          else:
-            next_state[led] = 0  # death
-        else:  # dead
-          if live_neighbors in new_born:
-            next_state[led] = 1  # birth
-
-      current_state = next_state
-
-      if iterations > 0:
-        iterations -= 1
-
-    return current_state
-
-
-  def _display_state(self, state, colormap):
-    disc_byte_ofs = (self.bus_offset+1)*4
-    for led, value in enumerate(state):
-      led_ofs = disc_byte_ofs + led*4
-      self._spi_data[led_ofs:led_ofs+4] = colormap[value]
+          copy = bytearray(state)
+          yield copy
+          state[:] = copy  # Carry any changes made to it forward.
+    finally:
+      states.close()
+
+
+  def displayed(self, states, alive=orig):
+    """Stage showing each state on the LEDs as it passes, unpaced."""
+    palette = self._palette(alive)
+    for state in states:
+      self._display_state(state, palette)
+      yield state
+
+
+  def _palette(self, alive):
+    """4 bytes of LED data per age, in the form fill_leds() takes."""
+    assert len(alive)
+    palette = bytearray(apa102._brightness(apa102.led_off, self.brightness))
+    for color in alive:
+      assert len(color) == 4
+      palette += apa102._brightness(color, self.brightness)
+    return palette_colors(palette)
+
+
+  def _run_steps(self, initial_state, alive, sleep_ms, iterations,
+                 stay_alive, new_born, sectors, processes):
+    """Generator doing the work of run() one frame at a time.
+
+    Each frame is displayed then the next generation is computed before
+    yielding so that the caller's wait for the frame deadline soaks up
+    the computation time.  Display is therefore done here rather than
+    by a displayed() stage, which would show each generation late by
+    the time it took to compute.  Yields the number of extra
+    milliseconds to pause for (non-zero after a dieoff, which is
+    reseeded before the pause so that it shows straight after).
+    Returns the final state.
+    """
+    palette = self._palette(alive)
+    life_stats = self.stats
+    generations = self.generations(
+        initial_state, stay_alive=stay_alive, new_born=new_born,
+        max_alive=len(alive), reuse=True, sectors=sectors,
+        processes=processes)
+    states = detect_cycles(generations, life_stats)
+    try:
+      current_state = next(states)
+
+      reseeder = self.reseeder
+      reseeder.rules = (stay_alive, new_born)
+      reseeder.record(current_state)
+      rounds_alive = 0
+      while iterations != 0:
+        # Display the current state.
+        self._display_state(current_state, palette)
+        life_stats.rounds += 1
+        rounds_alive += 1
+
+        # all dead, restart.
+        pause_ms = 0
+        if (max(current_state) == 0):
+          life_stats.dieoffs += 1
+          reseeder.died(rounds_alive)
+          rounds_alive = 0
+          pause_ms = 1000+sleep_ms*3
+          reseeder.reseed(current_state)  # In place, generations() continues.
+
+        # Compute the next iteration.
+        current_state = next(states)
+
+        if iterations > 0:
+          iterations -= 1
+        yield pause_ms
+
+      return bytearray(current_state)  # A copy, the buffers are reused.
+    finally:
+      generations.close()  # Stops any parallel sector workers.
+
+
+  def _display_state(self, state, palette):
+    fill_leds(self._spi_data, (self.bus_offset+1)*4, state, palette)
     self.spi.write(self._spi_data)
 
 
@@ -211,261 +327,217 @@ class Life(object):
 
 
   def _static_set_neighbors(self):
-    # This looks gross but is intended to be an low memory
-    # consumption data structure for LED neighbor lookups.
-    self._neighbors = \
-(b'\x01/0',
- b'\x00\x021',
- b'\x01\x032',
- b'\x02\x043',
- b'\x03\x054',
- b'\x04\x0645',
- b'\x05\x0756',
- b'\x06\x0867',
- b'\x07\t78',
- b'\x08\n8',
- b'\t\x0b9',
- b'\n\x0c:',
- b'\x0b\r;',
- b'\x0c\x0e<',
- b'\r\x0f=',
- b'\x0e\x10>',
- b'\x0f\x11?',
- b'\x10\x12?@',
- b'\x11\x13@A',
- b'\x12\x14AB',
- b'\x13\x15BC',
- b'\x14\x16C',
- b'\x15\x17D',
- b'\x16\x18E',
- b'\x17\x19F',
- b'\x18\x1aG',
- b'\x19\x1bH',
- b'\x1a\x1cI',
- b'\x1b\x1dJ',
- b'\x1c\x1eJK',
- b'\x1d\x1fKL',
- b'\x1e LM',
- b'\x1f!MN',
- b' "N',
- b'!#O',
- b'"$P',
- b'#%Q',
- b'$&R',
- b"%'S",
- b'&(T',
- b"')U",
- b'(*UV',
- b')+VW',
- b'*,WX',
- b'+-XY',
- b',.Y',
- b'-/Z',
- b'\x00.[',
- b'\x001[\\',
- b'\x0102]',
- b'\x0213^',
- b'\x0324_',
- b'\x04\x0535_`',
- b'\x05\x0646`a',
- b'\x06\x0757ab',
- b'\x07\x0868bc',
- b'\t79c',
- b'\n8:d',
- b'\x0b9;e',
- b'\x0c:<f',
- b'\r;=g',
- b'\x0e<>h',
- b'\x0f=?i',
- b'\x10\x11>@ij',
- b'\x11\x12?Ajk',
- b'\x12\x13@Bkl',
- b'\x13\x14AClm',
- b'\x15BDm',
- b'\x16CEn',
- b'\x17DFo',
- b'\x18EGp',
- b'\x19FHq',
- b'\x1aGIr',
- b'\x1bHJs',
- b'\x1c\x1dIKst',
- b'\x1d\x1eJLtu',
- b'\x1e\x1fKMuv',
- b'\x1f LNvw',
- b'!MOw',
- b'"NPx',
- b'#OQy',
- b'$PRz',
- b'%QS{',
- b'&RT|',
- b"'SU}",
- b'()TV}~',
- b')*UW~\x7f',
- b'*+VX\x7f\x80',
- b'+,WY\x80\x81',
- b'-XZ\x81',
- b'.Y[\x82',
- b'/0Z\x83',
- b'0]\x83\x84',
- b'1\\^\x85',
- b'2]_\x85\x86',
- b'3^`\x86\x87',
- b'45_a\x87',
- b'56`b\x88',
- b'67ac\x89',
- b'8bd\x89\x8a',
- b'9ce\x8a\x8b',
- b':df\x8b',
- b';eg\x8c',
- b'<fh\x8d',
- b'=gi\x8d\x8e',
- b'>hj\x8e\x8f',
- b'?@ik\x8f',
- b'@Ajl\x90',
- b'ABkm\x91',
- b'Cln\x91\x92',
- b'Dmo\x92\x93',
- b'Enp\x93',
- b'Foq\x94',
- b'Gpr\x95',
- b'Hqs\x95\x96',
- b'Irt\x96\x97',
- b'JKsu\x97',
- b'KLtv\x98',
- b'LMuw\x99',
- b'Nvx\x99\x9a',
- b'Owy\x9a\x9b',
- b'Pxz\x9b',
- b'Qy{\x9c',
- b'Rz|\x9d',
- b'S{}\x9d\x9e',
- b'T|~\x9e\x9f',
- b'UV}\x7f\x9f',
- b'VW~\x80\xa0',
- b'WX\x7f\x81\xa1',
- b'Y\x80\x82\xa1\xa2',
- b'Z\x81\x83\xa2\xa3',
- b'[\\\x82\xa3',
- b'\\\x85\xa3\xa4',
- b']\x84\x86\xa5',
- b'^_\x85\x87\xa6',
- b'`\x86\x88\xa6\xa7',
- b'a\x87\x89\xa7\xa8',
- b'b\x88\x8a\xa8\xa9',
- b'cd\x89\x8b\xa9',
- b'e\x8a\x8c\xaa',
- b'f\x8b\x8d\xab',
- b'g\x8c\x8e\xac',
- b'hi\x8d\x8f\xad',
- b'j\x8e\x90\xad\xae',
- b'k\x8f\x91\xae\xaf',
- b'l\x90\x92\xaf\xb0',
- b'mn\x91\x93\xb0',
- b'o\x92\x94\xb1',
- b'p\x93\x95\xb2',
- b'q\x94\x96\xb3',
- b'rs\x95\x97\xb4',
- b't\x96\x98\xb4\xb5',
- b'u\x97\x99\xb5\xb6',
- b'v\x98\x9a\xb6\xb7',
- b'wx\x99\x9b\xb7',
- b'y\x9a\x9c\xb8',
- b'z\x9b\x9d\xb9',
- b'{\x9c\x9e\xba',
- b'|}\x9d\x9f\xbb',
- b'~\x9e\xa0\xbb\xbc',
- b'\x7f\x9f\xa1\xbc\xbd',
- b'\x80\xa0\xa2\xbd\xbe',
- b'\x81\x82\xa1\xa3\xbe',
- b'\x83\x84\xa2\xbf',
- b'\x84\xa5\xbf\xc0',
- b'\x85\xa4\xa6\xc1',
- b'\x86\xa5\xa7\xc2',
- b'\x87\x88\xa6\xa8\xc2\xc3',
- b'\x88\x89\xa7\xa9\xc3\xc4',
- b'\x8a\xa8\xaa\xc4',
- b'\x8b\xa9\xab\xc5',
- b'\x8c\xaa\xac\xc6',
- b'\x8d\xab\xad\xc7',
- b'\x8e\xac\xae\xc8',
- b'\x8f\x90\xad\xaf\xc8\xc9',
- b'\x90\x91\xae\xb0\xc9\xca',
- b'\x92\xaf\xb1\xca',
- b'\x93\xb0\xb2\xcb',
- b'\x94\xb1\xb3\xcc',
- b'\x95\xb2\xb4\xcd',
- b'\x96\xb3\xb5\xce',
- b'\x97\x98\xb4\xb6\xce\xcf',
- b'\x98\x99\xb5\xb7\xcf\xd0',
- b'\x9a\xb6\xb8\xd0',
- b'\x9b\xb7\xb9\xd1',
- b'\x9c\xb8\xba\xd2',
- b'\x9d\xb9\xbb\xd3',
- b'\x9e\xba\xbc\xd4',
- b'\x9f\xa0\xbb\xbd\xd4\xd5',
- b'\xa0\xa1\xbc\xbe\xd5\xd6',
- b'\xa2\xbd\xbf\xd6',
- b'\xa3\xa4\xbe\xd7',
- b'\xa4\xc1\xd7\xd8',
- b'\xa5\xc0\xc2\xd9',
- b'\xa6\xa7\xc1\xc3\xd9\xda',
- b'\xa7\xa8\xc2\xc4\xda\xdb',
- b'\xa9\xc3\xc5\xdb',
- b'\xaa\xc4\xc6\xdc',
- b'\xab\xc5\xc7\xdd',
- b'\xac\xc6\xc8\xde',
- b'\xad\xae\xc7\xc9\xde\xdf',
- b'\xae\xaf\xc8\xca\xdf\xe0',
- b'\xb0\xc9\xcb\xe0',
- b'\xb1\xca\xcc\xe1',
- b'\xb2\xcb\xcd\xe2',
- b'\xb3\xcc\xce\xe3',
- b'\xb4\xb5\xcd\xcf\xe3\xe4',
- b'\xb5\xb6\xce\xd0\xe4\xe5',
- b'\xb7\xcf\xd1\xe5',
- b'\xb8\xd0\xd2\xe6',
- b'\xb9\xd1\xd3\xe7',
- b'\xba\xd2\xd4\xe8',
- b'\xbb\xbc\xd3\xd5\xe8\xe9',
- b'\xbc\xbd\xd4\xd6\xe9\xea',
- b'\xbe\xd5\xd7\xea',
- b'\xbf\xc0\xd6\xeb',
- b'\xc0\xd9\xeb\xec',
- b'\xc1\xd8\xda\xec\xed',
- b'\xc2\xc3\xd9\xdb\xed',
- b'\xc3\xc4\xda\xdc\xee',
- b'\xc5\xdb\xdd\xee\xef',
- b'\xc6\xdc\xde\xef',
- b'\xc7\xdd\xdf\xef\xf0',
- b'\xc8\xc9\xde\xe0\xf0',
- b'\xc9\xca\xdf\xe1\xf1',
- b'\xcb\xe0\xe2\xf1\xf2',
- b'\xcc\xe1\xe3\xf2',
- b'\xcd\xe2\xe4\xf2\xf3',
- b'\xce\xcf\xe3\xe5\xf3',
- b'\xcf\xd0\xe4\xe6\xf4',
- b'\xd1\xe5\xe7\xf4\xf5',
- b'\xd2\xe6\xe8\xf5',
- b'\xd3\xe7\xe9\xf5\xf6',
- b'\xd4\xd5\xe8\xea\xf6',
- b'\xd5\xd6\xe9\xeb\xf7',
- b'\xd7\xd8\xea\xec\xf7',
- b'\xd8\xed\xf7\xf8',
- b'\xd9\xda\xec\xee\xf8\xf9',
- b'\xdb\xed\xef\xf9',
- b'\xdd\xee\xf0\xf9\xfa',
- b'\xde\xdf\xef\xf1\xfa',
- b'\xe0\xf0\xf2\xfa\xfb',
- b'\xe2\xf1\xf3\xfb',
- b'\xe3\xe4\xf2\xf4\xfb\xfc',
- b'\xe5\xf3\xf5\xfc',
- b'\xe7\xf4\xf6\xfc\xfd',
- b'\xe8\xe9\xf5\xf7\xfd',
- b'\xea\xec\xf6\xf8\xfd',
- b'\xec\xf9\xfd\xfe',
- b'\xee\xf8\xfa\xfe',
- b'\xf0\xf9\xfb\xfe',
- b'\xf2\xfa\xfc\xfe',
- b'\xf4\xfb\xfd\xfe',
- b'\xf6\xf8\xfc\xfe',
- b'\xf8\xf9\xfa\xfb\xfc\xfd')
+    self._neighbors = DISC_NEIGHBORS
+
+
+def py_next_generation(neighbors, current_state, stay_alive, new_born,
+                       max_alive):
+  """Returns a new state one generation after current_state.
+
+  Args:
+    neighbors: A sequence of neighbor LED numbers for each LED.
+    current_state: A bytearray of each LED's age, 0 being dead.
+    stay_alive: LIFE - Number of neighbors required for a pixel to live.
+    new_born: LIFE - Number of neighbors for new life on a dead pixel.
+    max_alive: The age at which a pixel stops getting older.
+  """
+  next_state = bytearray(len(current_state))
+  py_next_generation_into(neighbors, current_state, next_state, stay_alive,
+                          new_born, max_alive)
+  return next_state
+
+
+def py_next_generation_into(neighbors, current_state, next_state, stay_alive,
+                            new_born, max_alive):
+  """py_next_generation() writing into next_state, a separate buffer."""
+  for led, alive in enumerate(current_state):
+    live_neighbors = 0
+    for neighbor in neighbors[led]:
+      if current_state[neighbor]:
+        live_neighbors += 1
+    live_neighbors %= 7  # HACK, for torus to be meaningful.
+    if alive:
+      if live_neighbors in stay_alive:
+        next_state[led] = min(alive+1, max_alive)
+      else:
+        next_state[led] = 0  # death
+    elif live_neighbors in new_born:
+      next_state[led] = 1  # birth
+    else:
+      next_state[led] = 0
+
+
+def pack_neighbors(neighbors) -> bytearray:
+  """Packs neighbors into one buffer for viper_kernels.step().
+
+  u16 offsets of where each LED's neighbor list starts, plus one for
+  the end of the last list, followed by all of the lists.
+  """
+  offset = 2*(len(neighbors)+1)
+  table = bytearray(offset + sum(len(leds) for leds in neighbors))
+  starts = []
+  for leds in neighbors:
+    starts.append(offset)
+    table[offset:offset+len(leds)] = leds
+    offset += len(leds)
+  starts.append(offset)
+  for idx, start in enumerate(starts):
+    table[2*idx] = start & 0xff
+    table[2*idx+1] = start >> 8
+  return table
+
+
+class PackedNeighbors(object):
+  def __init__(self, table):
+    """A read only neighbors sequence backed by a pack_neighbors() table.
+
+    Items are zero-copy memoryviews rather than bytes.
+    """
+    self.table = memoryview(table)
+    self._num_leds = (table[0] | table[1] << 8)//2 - 1
+
+  @classmethod
+  def load(cls, path):
+    with open(path, 'rb') as table_file:
+      return cls(table_file.read())
+
+  def __len__(self):
+    return self._num_leds
+
+  def __getitem__(self, led: int):
+    if not 0 <= led < self._num_leds:
+      raise IndexError(led)
+    table = self.table
+    start = table[2*led] | table[2*led+1] << 8
+    return table[start:table[2*led+2] | table[2*led+3] << 8]
+
+  def __iter__(self):
+    for led in range(self._num_leds):
+      yield self[led]
+
+  def decode(self) -> tuple:
+    """The neighbors as a tuple of bytes, like DISC_NEIGHBORS in source."""
+    return tuple(bytes(leds) for leds in self)
+
+
+def pack_rules(stay_alive, new_born, max_alive: int) -> int:
+  """Packs LIFE rules into one int for viper_kernels.step()."""
+  rules = max_alive << 16
+  for count in stay_alive:
+    rules |= (1 << count) & 0xff
+  for count in new_born:
+    rules |= ((1 << count) & 0xff) << 8
+  return rules
+
+
+_packed_neighbors = [None, None]  # The last neighbors and their table.
+
+
+def viper_next_generation(neighbors, current_state, stay_alive, new_born,
+                          max_alive):
+  """py_next_generation() using viper_kernels.step()."""
+  next_state = bytearray(len(current_state))
+  viper_next_generation_into(neighbors, current_state, next_state, stay_alive,
+                             new_born, max_alive)
+  return next_state
+
+
+def viper_next_generation_into(neighbors, current_state, next_state,
+                               stay_alive, new_born, max_alive):
+  if isinstance(neighbors, PackedNeighbors):
+    table = neighbors.table
+  else:
+    if _packed_neighbors[0] is not neighbors:
+      _packed_neighbors[1] = pack_neighbors(neighbors)
+      _packed_neighbors[0] = neighbors
+    table = _packed_neighbors[1]
+  viper_kernels.step(table, current_state, next_state,
+                     pack_rules(stay_alive, new_born, max_alive))
+  return next_state
+
+
+def py_palette_colors(palette) -> tuple:
+  """Splits a palette of 4 bytes per age into the colors py_fill_leds takes.
+
+  Done once per palette so that displaying a frame allocates nothing.
+  """
+  return tuple(bytes(palette[idx:idx+4]) for idx in range(0, len(palette), 4))
+
+
+def py_fill_leds(out, offset: int, state, colors):
+  """Copies the 4 byte color for each age in state into out."""
+  for value in state:
+    out[offset:offset+4] = colors[value]
+    offset += 4
+
+
+def detect_cycles(states, life_stats):
+  """Stage counting cultures that settle into a repeating cycle.
+
+  Uses Brent's algorithm so only one extra state is kept however long
+  the period.  A dead culture is a dieoff, not a cycle, and resets the
+  detection as it is about to be reseeded.
+
+  Args:
+    states: An iterator of states such as Life.generations().
+    life_stats: A stats.LifeStats whose cyclic count is incremented.
+  """
+  tortoise = None
+  power = steps = 0
+  cycling = False
+  for state in states:
+    if max(state) == 0:
+      power = steps = 0
+      cycling = False
+    elif not cycling:
+      if power and state == tortoise:
+        life_stats.cyclic += 1
+        cycling = True
+      elif steps == power:
+        if tortoise is None:
+          tortoise = bytearray(len(state))
+        tortoise[:] = state
+        power = power*2 or 1
+        steps = 0
+      steps += 1
+    yield state
+
+
+def record(states, history):
+  """Stage appending a bytes copy of each state to history.
+
+  Pass a collections.deque with a maxlen to bound the memory used.
+  """
+  for state in states:
+    history.append(bytes(state))
+    yield state
+
+
+if viper_kernels:
+  next_generation = viper_next_generation
+  next_generation_into = viper_next_generation_into
+  fill_leds = viper_kernels.fill_leds
+  palette_colors = bytes  # The viper kernel indexes the palette itself.
+else:
+  next_generation = py_next_generation
+  next_generation_into = py_next_generation_into
+  fill_leds = py_fill_leds
+  palette_colors = py_palette_colors
+
+
+def _data_path(name: str) -> str:
+  """Path of a data file installed next to this module."""
+  if '/' in __file__:
+    return __file__.rsplit('/', 1)[0] + '/' + name
+  return name
+
+
+try:
+  from disc_neighbors import DISC_NEIGHBORS
+except ImportError:  # Deployed with utils/build_mpy.py --neighbors-data.
+  DISC_NEIGHBORS = PackedNeighbors.load(_data_path('disc_neighbors.bin'))
+  if not viper_kernels:
+    # The viper step walks the packed table itself.  The pure Python one
+    # indexes an item per LED per generation, so decode once rather than
+    # allocating a memoryview slice for each of them.
+    DISC_NEIGHBORS = DISC_NEIGHBORS.decode()
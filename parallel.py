@@ -0,0 +1,181 @@
+# python3
+# vim: set sw=2 ai expandtab
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Step LIFE across several cores by splitting the topology into sectors.
+
+Cells are split into contiguous runs of LED numbers, which on a disc are
+runs around its rings, balanced by how many neighbors they look at.
+Each sector precomputes its halo: the cells outside it that its cells
+neighbor.  A generation is one gather of the sector's cells plus halo
+into a private buffer, the usual next_generation_into() on a local copy
+of the topology and a write of the sector's own cells into the shared
+output buffer.  Sectors never write the same cell so a barrier to start
+each generation and one to finish it are the only synchronization.
+
+Life.generations(sectors=N) steps a Life's own topology this way.
+
+This is for workstations simulating large chained installations.
+Threads only run in parallel on a Python without a GIL, so use
+processes=True (Linux, it relies on fork) elsewhere.  MicroPython's
+_thread has no barrier and still shares one core, so it is not
+supported there.
+"""
+
+import multiprocessing
+import threading
+
+import life
+
+
+class Sector(object):
+  def __init__(self, neighbors, start: int, end: int):
+    """Cells start up to end of neighbors and the halo they read."""
+    self.start = start
+    self.end = end
+    halo = []
+    local = {}
+    for led in range(start, end):
+      for neighbor in neighbors[led]:
+        if not start <= neighbor < end and neighbor not in local:
+          local[neighbor] = end - start + len(halo)
+          halo.append(neighbor)
+    self.halo = tuple(halo)
+    # The sector's topology in local numbering: its own cells first,
+    # then the halo, which has no neighbors as we never use its results.
+    local_neighbors = []
+    for led in range(start, end):
+      local_leds = [neighbor - start if start <= neighbor < end
+                    else local[neighbor] for neighbor in neighbors[led]]
+      if end - start + len(halo) <= 256:
+        local_neighbors.append(bytes(local_leds))
+      else:
+        local_neighbors.append(tuple(local_leds))
+    local_neighbors.extend([b''] * len(halo))
+    self.neighbors = tuple(local_neighbors)
+    self._current = bytearray(len(local_neighbors))
+    self._next = bytearray(len(local_neighbors))
+
+  def step(self, current_state, next_state, stay_alive, new_born, max_alive):
+    """Writes the sector's cells of the generation after current_state."""
+    size = self.end - self.start
+    local = self._current
+    local[:size] = current_state[self.start:self.end]
+    for idx, led in enumerate(self.halo, size):
+      local[idx] = current_state[led]
+    life.next_generation_into(self.neighbors, local, self._next, stay_alive,
+                              new_born, max_alive)
+    next_state[self.start:self.end] = self._next[:size]
+
+
+def partition(neighbors, num_sectors: int) -> list:
+  """Splits neighbors into up to num_sectors Sectors of similar work."""
+  work = [1 + len(leds) for leds in neighbors]
+  total = sum(work)
+  sectors = []
+  start = done = 0
+  for led, cost in enumerate(work):
+    done += cost
+    if done * num_sectors >= total * (len(sectors) + 1) or led == len(work)-1:
+      sectors.append(Sector(neighbors, start, led + 1))
+      start = led + 1
+  return sectors
+
+
+def chained_neighbors(neighbors=life.DISC_NEIGHBORS, copies=2,
+                      ring_size=life.DISC_RINGS[0]) -> tuple:
+  """copies of a disc topology, each stacked on the next.
+
+  Outer ring LED n of each disc also neighbors outer ring LED n of the
+  discs before and after it on the bus.
+  """
+  num_leds = len(neighbors)
+  chained = []
+  for disc in range(copies):
+    base = disc * num_leds
+    for led, leds in enumerate(neighbors):
+      linked = [base + neighbor for neighbor in leds]
+      if led < ring_size:
+        if disc:
+          linked.append(base - num_leds + led)
+        if disc + 1 < copies:
+          linked.append(base + num_leds + led)
+      chained.append(tuple(linked))
+  return tuple(chained)
+
+
+def _work(sector, buffers, barrier, rules):
+  """A worker's loop: wait for the go, step its sector, meet the others.
+
+  Runs until the barrier is aborted.
+  """
+  src = 0
+  try:
+    while True:
+      barrier.wait()
+      sector.step(buffers[src], buffers[1-src], *rules)
+      barrier.wait()
+      src = 1 - src
+  except threading.BrokenBarrierError:
+    return
+  except BaseException:
+    barrier.abort()  # Fail the other participants rather than hang them.
+    raise
+
+
+class ParallelLife(object):
+  def __init__(self, neighbors, num_sectors=2, *, processes=False,
+               stay_alive=(2,3), new_born=(2,5), max_alive=1):
+    """Steps generations of neighbors with num_sectors sectors in parallel.
+
+    The calling thread steps the first sector itself so num_sectors-1
+    threads or processes are started.
+    """
+    self.num_leds = len(neighbors)
+    self.sectors = partition(neighbors, num_sectors)
+    self.processes = processes
+    self.rules = (stay_alive, new_born, max_alive)
+
+  def generations(self, initial_state=()):
+    """Yields each generation, starting with initial_state.
+
+    initial_state is a sequence of the LEDs alive at the start.  Like
+    Life.generations(reuse=True) two buffers alternate, so copy a state
+    to keep it, and changes made in place to a yielded state carry
+    forward: workers wait while it is in use.  Closing the generator
+    stops the workers.
+    """
+    if self.processes:
+      context = multiprocessing.get_context('fork')
+      buffers = [memoryview(context.RawArray('B', self.num_leds)).cast('B')
+                 for _ in range(2)]
+      barrier = context.Barrier(len(self.sectors))
+      start_worker = lambda *args: context.Process(target=_work, args=args)
+    else:
+      buffers = [bytearray(self.num_leds), bytearray(self.num_leds)]
+      barrier = threading.Barrier(len(self.sectors))
+      start_worker = lambda *args: threading.Thread(target=_work, args=args)
+    for led in initial_state:
+      buffers[0][led] = 1
+
+    workers = [start_worker(sector, buffers, barrier, self.rules)
+               for sector in self.sectors[1:]]
+    for worker in workers:
+      worker.daemon = True
+      worker.start()
+    own_sector = self.sectors[0]
+    src = 0
+    try:
+      yield buffers[src]
+      while True:
+        barrier.wait()  # Go.
+        own_sector.step(buffers[src], buffers[1-src], *self.rules)
+        barrier.wait()  # Everyone is done.
+        src = 1 - src
+        yield buffers[src]
+    finally:
+      barrier.abort()  # Stops the workers wherever they are.
+      for worker in workers:
+        worker.join()
@@ -0,0 +1,134 @@
+# MicroPython python3
+# vim: set sw=2 ai expandtab
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""A compact bank of scored LIFE seed patterns.
+
+File format, all little endian:
+
+  header: b'LCPB', u8 version, u8 record size, u16 record count
+  records, highest scoring first, each:
+    32 bytes: bitset of live cells, LED n is bit n%8 of byte n//8.
+    u32 lifetime: generations before the culture died or repeated.
+    u16 period: cycle length it settled into, 0 if it died or was still
+        going when the simulation gave up.
+    u8 stay_alive: bit n set if n neighbors keep a cell alive.
+    u8 new_born: bit n set if n neighbors give birth to a cell.
+
+Records are fixed size so a bank is read into RAM in one go and
+individual fields are only decoded on demand.  utils/build_pattern_bank.py
+creates banks from simulation results.
+"""
+
+try:
+  import ustruct as struct
+except ImportError:
+  import struct
+
+from apa102 import NUM_DISC_LEDS
+
+MAGIC = b'LCPB'
+VERSION = 1
+_HEADER = '<4sBBH'
+_HEADER_SIZE = 8
+_META = '<IHBB'
+CELL_BYTES = (NUM_DISC_LEDS + 7) // 8
+RECORD_SIZE = CELL_BYTES + 8
+
+
+def rules_to_mask(counts) -> int:
+  mask = 0
+  for count in counts:
+    mask |= 1 << count
+  return mask
+
+
+def mask_to_rules(mask: int) -> tuple:
+  return tuple(count for count in range(8) if mask & (1 << count))
+
+
+def cells_to_bitset(leds) -> bytes:
+  bitset = bytearray(CELL_BYTES)
+  for led in leds:
+    bitset[led >> 3] |= 1 << (led & 7)
+  return bytes(bitset)
+
+
+def encode_record(leds, lifetime: int, period: int, stay_alive,
+                  new_born) -> bytes:
+  return cells_to_bitset(leds) + struct.pack(
+      _META, min(lifetime, 0xffffffff), min(period, 0xffff),
+      rules_to_mask(stay_alive), rules_to_mask(new_born))
+
+
+def encode_bank(records) -> bytes:
+  """Returns bank file contents for a sequence of encode_record() values."""
+  records = list(records)
+  for record in records:
+    if len(record) != RECORD_SIZE:
+      raise ValueError('record must be %d bytes' % RECORD_SIZE)
+  header = struct.pack(_HEADER, MAGIC, VERSION, RECORD_SIZE, len(records))
+  return header + b''.join(records)
+
+
+class PatternBank(object):
+  def __init__(self, data):
+    """A pattern bank backed by data, the contents of a bank file."""
+    magic, version, record_size, count = struct.unpack_from(_HEADER, data, 0)
+    if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+      raise ValueError('not a version %d pattern bank' % VERSION)
+    if len(data) < _HEADER_SIZE + count*RECORD_SIZE:
+      raise ValueError('truncated pattern bank')
+    self._data = memoryview(data)
+    self._count = count
+
+  @classmethod
+  def load(cls, path):
+    with open(path, 'rb') as bank_file:
+      return cls(bank_file.read())
+
+  def __len__(self):
+    return self._count
+
+  def _offset(self, idx: int) -> int:
+    if not 0 <= idx < self._count:
+      raise IndexError(idx)
+    return _HEADER_SIZE + idx*RECORD_SIZE
+
+  def bitset(self, idx: int):
+    """A zero-copy memoryview of pattern idx's live cell bitset."""
+    offset = self._offset(idx)
+    return self._data[offset:offset+CELL_BYTES]
+
+  def cells(self, idx: int) -> list:
+    """The LED numbers alive in pattern idx."""
+    leds = []
+    for byte_no, bits in enumerate(self.bitset(idx)):
+      led = byte_no * 8
+      while bits:
+        if bits & 1:
+          leds.append(led)
+        bits >>= 1
+        led += 1
+    return leds
+
+  def meta(self, idx: int) -> tuple:
+    """(lifetime, period, stay_alive, new_born) for pattern idx."""
+    lifetime, period, stay_mask, born_mask = struct.unpack_from(
+        _META, self._data, self._offset(idx) + CELL_BYTES)
+    return lifetime, period, mask_to_rules(stay_mask), mask_to_rules(born_mask)
+
+  def matching(self, stay_alive, new_born) -> list:
+    """Indexes of the patterns scored using the given rules."""
+    stay_mask = rules_to_mask(stay_alive)
+    born_mask = rules_to_mask(new_born)
+    found = []
+    data = self._data
+    for idx in range(self._count):
+      offset = _HEADER_SIZE + idx*RECORD_SIZE + CELL_BYTES + 6
+      if data[offset] == stay_mask and data[offset+1] == born_mask:
+        found.append(idx)
+    return found
+
@@ -0,0 +1,207 @@
+# MicroPython python3
+# vim: set sw=2 ai expandtab
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Reproducible reseeding of a LIFE culture after it dies off.
+
+Every reseed draws from a small seedable PRNG and is logged as
+"reseed #<n> <strategy> seed=0x<prng state>" so that a run seen on a
+device can be replayed exactly on a workstation:
+
+  reseeder = reseed.Reseeder(seed=0x1234abcd)
+  life.Life(reseeder=reseeder).run()
+
+or an individual reseed with reseeder.replay(state, seed, strategy).
+"""
+
+import os
+
+from apa102 import DISC_RINGS, DISC_RING_OFFSETS, NUM_DISC_LEDS
+
+
+class XorShift32(object):
+  """Marsaglia's xorshift32.  Fast, tiny and plenty random for LEDs."""
+
+  def __init__(self, seed: int):
+    self.seed(seed)
+
+  def seed(self, seed: int):
+    self.state = (seed & 0xffffffff) or 0x9e3779b9  # 0 is a fixed point.
+
+  def next(self) -> int:
+    x = self.state
+    x ^= (x << 13) & 0xffffffff
+    x ^= x >> 17
+    x ^= (x << 5) & 0xffffffff
+    self.state = x
+    return x
+
+  def below(self, n: int) -> int:
+    """Returns a value in [0, n) for n <= 2**16 with negligible bias."""
+    return ((self.next() >> 16) * n) >> 16
+
+
+# Seeds found by simulation to live for thousands of generations before
+# settling into a cycle under the default (2,3)/(2,5) rules.  The first is
+# Life._default_start_state.
+LIBRARY = (
+    (1, 5, 9, 10, 11, 12, 13, 14, 15, 58, 59, 60, 61, 62, 63, 64, 200, 201,
+     202, 203, 209, 240, 241, 242, 243, 245, 254, 253, 252, 251),
+    (2, 5, 28, 29, 30, 47, 65, 69, 95, 97, 99, 100, 101, 112, 130, 152, 188,
+     200, 231, 252, 253, 254),
+    (10, 21, 36, 37, 51, 59, 70, 73, 88, 97, 124, 127, 136, 138, 140, 141,
+     146, 175, 184, 192, 195, 198, 200, 201, 204, 206, 207, 208, 213, 217,
+     222, 227, 233, 235, 238, 249, 251, 254),
+    (0, 12, 16, 60, 68, 80, 83, 87, 90, 96, 97, 100, 103, 113, 116, 120, 121,
+     130, 134, 139, 140, 142, 147, 151, 161, 165, 171, 175, 177, 182, 190,
+     191, 202, 211, 218, 222, 248, 249, 254),
+    (0, 2, 25, 26, 41, 44, 48, 62, 64, 78, 81, 90, 100, 116, 127, 129, 134,
+     141, 144, 155, 168, 173, 188, 202, 207, 212, 218, 219, 220, 224, 225,
+     228, 241, 244, 245, 247, 252, 253),
+)
+
+
+# Strategies take (rng, reseeder) and return the LEDs to bring to life.
+
+def sprinkle(rng, reseeder, count=23):
+  """Random cells anywhere on the disc."""
+  return [rng.below(NUM_DISC_LEDS) for _ in range(count)]
+
+
+def library(rng, reseeder):
+  """A known long-lived pattern, maybe rotated by a half turn."""
+  pattern = reseeder.library[rng.below(len(reseeder.library))]
+  return rotate(pattern, rng.below(2)*2)
+
+
+def ring_symmetric(rng, reseeder):
+  """Random cells repeated with 2-fold rotational symmetry."""
+  folds = 2  # Like rotate(), only half turns match the topology.
+  leds = []
+  for ring_size, ring_offset in zip(DISC_RINGS, DISC_RING_OFFSETS):
+    if ring_size % folds:
+      continue
+    arc = ring_size // folds
+    for _ in range(rng.below(3)):
+      pos = rng.below(arc)
+      for fold in range(folds):
+        leds.append(ring_offset + pos + fold*arc)
+  return leds
+
+
+def mutate_last(rng, reseeder, flips=5):
+  """The seed of the last long-lived culture with a few cells flipped."""
+  if reseeder.last_long_lived is None:
+    return sprinkle(rng, reseeder)
+  leds = [led for led, alive in enumerate(reseeder.last_long_lived) if alive]
+  for _ in range(flips):
+    led = rng.below(NUM_DISC_LEDS)
+    if led in leds:
+      leds.remove(led)
+    else:
+      leds.append(led)
+  return leds
+
+
+def bank(rng, reseeder):
+  """A scored pattern from reseeder.bank matching the current rules."""
+  if reseeder.bank is None:
+    return library(rng, reseeder)
+  candidates = reseeder.bank.matching(*reseeder.rules)
+  if not candidates:
+    return library(rng, reseeder)
+  pattern = reseeder.bank.cells(candidates[rng.below(len(candidates))])
+  return rotate(pattern, rng.below(2)*2)  # As scored, or a half turn.
+
+
+def rotate(leds, quarter_turns: int):
+  """Rotates LED numbers by (roughly, for small rings) quarter turns.
+
+  Only whole half turns map DISC_NEIGHBORS onto itself.  A quarter turn
+  changes which cells neighbor each other, so a rotated pattern no
+  longer behaves like the original.
+  """
+  rotated = []
+  for led in leds:
+    for ring_size, ring_offset in zip(DISC_RINGS, DISC_RING_OFFSETS):
+      if led < ring_offset + ring_size:
+        break
+    shift = ring_size * quarter_turns // 4
+    rotated.append(ring_offset + (led - ring_offset + shift) % ring_size)
+  return rotated
+
+
+STRATEGIES = {
+    'sprinkle': sprinkle,
+    'library': library,
+    'ring_symmetric': ring_symmetric,
+    'mutate_last': mutate_last,
+    'bank': bank,
+}
+
+
+class Reseeder(object):
+  def __init__(self, seed=None, *, strategies=('sprinkle', 'library',
+               'ring_symmetric', 'mutate_last'), long_lived_rounds=500,
+               bank=None, log=print):
+    """Chooses and logs how to bring a dead culture back to life.
+
+    Args:
+      seed: PRNG seed.  None picks one from os.urandom and logs it.
+      strategies: Names from STRATEGIES to pick from, equally weighted.
+          Repeat a name to weight it more heavily.
+      long_lived_rounds: Seeds living at least this long are remembered
+          for mutate_last.
+      bank: An optional patterns.PatternBank.  Adds the bank strategy.
+      log: Called with a message describing each seed used.
+    """
+    if seed is None:
+      seed = int.from_bytes(os.urandom(4), 'little')
+    self.seed = seed
+    self.rng = XorShift32(seed)
+    if bank is not None and 'bank' not in strategies:
+      strategies = tuple(strategies) + ('bank',)
+    self.strategies = tuple(strategies)
+    for name in self.strategies:
+      if name not in STRATEGIES:
+        raise ValueError('unknown reseed strategy ' + name)
+    self.long_lived_rounds = long_lived_rounds
+    self.library = LIBRARY
+    self.bank = bank
+    self.rules = ((2,3), (2,5))  # (stay_alive, new_born) in use.
+    self.log = log
+    self.count = 0
+    self.last_long_lived = None
+    self._candidate = None
+    if self.log:
+      self.log('reseed init seed=0x%08x' % seed)
+
+  def record(self, state):
+    """Notes the state a culture started from."""
+    self._candidate = bytes(state)
+
+  def died(self, rounds: int):
+    """Notes that the culture last recorded died after rounds generations."""
+    if self._candidate is not None and rounds >= self.long_lived_rounds:
+      self.last_long_lived = self._candidate
+
+  def reseed(self, state):
+    """Brings new life to state in place using the next strategy."""
+    name = self.strategies[self.rng.below(len(self.strategies))]
+    self.count += 1
+    if self.log:
+      self.log('reseed #%d %s seed=0x%08x' % (self.count, name, self.rng.state))
+    self._apply(state, name)
+    return name
+
+  def replay(self, state, seed: int, strategy: str):
+    """Repeats a logged reseed onto state."""
+    self.rng.seed(seed)
+    self._apply(state, strategy)
+
+  def _apply(self, state, name):
+    for led in STRATEGIES[name](self.rng, self):
+      state[led] = not state[led]
+    self.record(state)
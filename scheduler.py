@@ -0,0 +1,116 @@
+# MicroPython python3
+# vim: set sw=2 ai expandtab
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Steady frame pacing that cooperates with other (u)asyncio tasks.
+
+A FrameScheduler owns a frame deadline.  Rather than sleeping a fixed
+amount after each frame (which drifts by however long the frame took to
+compute), it sleeps until the deadline and then advances the deadline by
+exactly one period.  Other tasks run in whatever gap is left.
+"""
+
+try:
+  import uasyncio as asyncio
+except ImportError:
+  try:
+    import asyncio
+  except ImportError:
+    asyncio = None  # Only the blocking API is available, eg: CC3200 WiPy.
+import time
+
+
+# MicroPython has wrapping millisecond ticks, CPython does not.
+
+def ticks_ms() -> int:
+  if hasattr(time, 'ticks_ms'):
+    return time.ticks_ms()
+  return int(time.monotonic() * 1000)
+
+
+def ticks_add(ticks: int, delta: int) -> int:
+  if hasattr(time, 'ticks_add'):
+    return time.ticks_add(ticks, delta)
+  return ticks + delta
+
+
+def ticks_diff(end: int, start: int) -> int:
+  if hasattr(time, 'ticks_diff'):
+    return time.ticks_diff(end, start)
+  return end - start
+
+
+def sleep_ms(ms: int):
+  if hasattr(time, 'sleep_ms'):
+    time.sleep_ms(ms)
+  else:
+    time.sleep(ms / 1000)
+
+
+def async_sleep_ms(ms: int):
+  """Returns an awaitable sleeping for ms; sleep_ms(0) still yields."""
+  if hasattr(asyncio, 'sleep_ms'):
+    return asyncio.sleep_ms(ms)
+  return asyncio.sleep(ms / 1000)
+
+
+class FrameScheduler(object):
+  def __init__(self, period_ms: int):
+    """Pace frames period_ms apart.
+
+    Args:
+      period_ms: Milliseconds between frame deadlines.  0 never waits.
+    """
+    self.period_ms = period_ms
+    self.deadline = None
+    self.late_frames = 0  # Number of times we had to resync.
+
+  def start(self):
+    """(Re)starts pacing with the first deadline one period from now."""
+    self.deadline = ticks_add(ticks_ms(), self.period_ms)
+
+  def remaining_ms(self) -> int:
+    """Milliseconds left before the current frame deadline."""
+    if self.deadline is None:
+      self.start()
+    return ticks_diff(self.deadline, ticks_ms())
+
+  def _advance(self):
+    self.deadline = ticks_add(self.deadline, self.period_ms)
+    if self.period_ms and ticks_diff(self.deadline, ticks_ms()) <= 0:
+      # We fell an entire frame behind.  Resync rather than bursting
+      # out frames back to back to catch up.
+      self.late_frames += 1
+      self.start()
+
+  def wait_blocking(self):
+    """Blocks until the frame deadline then advances to the next one."""
+    remaining = self.remaining_ms()
+    if remaining > 0:
+      sleep_ms(remaining)
+    self._advance()
+
+  async def wait(self):
+    """Sleeps until the frame deadline letting other tasks run meanwhile."""
+    remaining = self.remaining_ms()
+    # Always yield, even when late, so other tasks are never starved.
+    await async_sleep_ms(max(0, remaining))
+    self._advance()
+
+
+def run_frames(frames, period_ms: int):
+  """Drive a generator that yields once per frame; blocking."""
+  pacer = FrameScheduler(period_ms)
+  pacer.start()
+  for _ in frames:
+    pacer.wait_blocking()
+
+
+async def run_frames_async(frames, period_ms: int):
+  """Drive a generator that yields once per frame as a coroutine."""
+  pacer = FrameScheduler(period_ms)
+  pacer.start()
+  for _ in frames:
+    await pacer.wait()
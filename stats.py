@@ -0,0 +1,120 @@
+# MicroPython python3
+# vim: set sw=2 ai expandtab
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Collect LIFE statistics each frame; render them when there is time.
+
+Pushing a frame buffer to an I2C OLED via display() takes many
+milliseconds.  Doing that inline with the LED frame loop stutters the
+LEDs so the StatsRenderer only pushes when the remaining idle time
+before the next frame deadline can absorb it.
+"""
+
+from scheduler import ticks_ms, ticks_diff
+
+
+class LifeStats(object):
+  """The metrics we track, updated by the simulation every frame."""
+  __slots__ = ('rounds', 'cyclic', 'dieoffs')
+
+  def __init__(self):
+    self.rounds = 0
+    self.cyclic = 0  # Cultures that settled into a repeating cycle.
+    self.dieoffs = 0
+
+
+# (row, label, LifeStats attribute, push immediately when it changes)
+_LAYOUT = (
+    (0, ' Rounds alive: ', 'rounds', False),
+    (1, 'Cyclic states: ', 'cyclic', False),
+    (2, 'Total dieoffs: ', 'dieoffs', True),
+)
+_VALUE_COL = 15
+
+
+class StatsRenderer(object):
+  def __init__(self, display, *, refresh_ms=1000, initial_cost_ms=30,
+               margin_ms=2):
+    """Render LifeStats onto a text display without missing frames.
+
+    Args:
+      display: An object with clear(), set_cursor(), set_text_cursor(),
+          write() and display() methods such as an SSD1306 driver.
+      refresh_ms: Minimum time between routine display() pushes.
+      initial_cost_ms: Guess at how long display() takes until measured.
+      margin_ms: Idle time to leave unused before a frame deadline.
+    """
+    self.display = display
+    self.refresh_ms = refresh_ms
+    self.cost_ms = initial_cost_ms
+    self.margin_ms = margin_ms
+    self._shown = [''] * len(_LAYOUT)
+    self._dirty = False
+    self._urgent = False
+    self._last_push = None
+
+  def start(self):
+    """Draw the static labels."""
+    if not self.display:
+      return
+    self.display.clear()
+    self.display.set_cursor(0,0)
+    for idx, (_, label, _, _) in enumerate(_LAYOUT):
+      self.display.write(label + '0' + ('\n' if idx+1 < len(_LAYOUT) else ''))
+      self._shown[idx] = '0'
+    self._dirty = True
+
+  def _draw(self, stats):
+    """Write only the changed characters into the display's buffer."""
+    for idx, (row, _, attr, urgent) in enumerate(_LAYOUT):
+      new = str(getattr(stats, attr))
+      old = self._shown[idx]
+      if new == old:
+        continue
+      if len(new) < len(old):
+        new_padded = new + ' '*(len(old)-len(new))
+      else:
+        new_padded = new
+      first = 0
+      while first < len(old) and new_padded[first] == old[first]:
+        first += 1
+      last = len(new_padded)
+      while last > first and last <= len(old) and new_padded[last-1] == old[last-1]:
+        last -= 1
+      self.display.set_text_cursor(_VALUE_COL+first, row)
+      self.display.write(new_padded[first:last])
+      self._shown[idx] = new
+      self._dirty = True
+      self._urgent = self._urgent or urgent
+
+  def render(self, stats, budget_ms: int):
+    """Update the display if it fits within budget_ms of idle time.
+
+    Returns:
+      True if display() was called.
+    """
+    if not self.display:
+      return False
+    self._draw(stats)
+    if not self._dirty:
+      return False
+    now = ticks_ms()
+    if (not self._urgent and self._last_push is not None and
+        ticks_diff(now, self._last_push) < self.refresh_ms):
+      return False
+    if self.cost_ms + self.margin_ms > budget_ms:
+      return False  # Try again during a later gap.
+    try:
+      self.display.display()
+    except Exception:
+      # Error updating, nothing we can do about it.
+      self.display = None
+      return False
+    elapsed = ticks_diff(ticks_ms(), now)
+    # Rise immediately, decay slowly: underestimating costs us a frame.
+    self.cost_ms = max(elapsed, (self.cost_ms*3 + elapsed) // 4)
+    self._last_push = now
+    self._dirty = self._urgent = False
+    return True
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+sys.path.insert(0, os.path.join(os.getcwd(), '8bit'))  # HACK
+import apa102
+import benchmark
+import generate_tables
+import reseed
+
+
+def _pack_state(state):
+  """The inverse of benchmark.unpack_state, like set_culture_value()."""
+  packed = bytearray((len(state) + 3) // 4)
+  for led, value in enumerate(state):
+    packed[led // 4] |= (value & 3) << (led % 4 * 2)
+  return bytes(packed)
+
+
+class TestBenchmarkHelpers(unittest.TestCase):
+
+  def testParseOutput(self):
+    output = ('Loaded 4242 .text at address 0x0\n'
+              '\x1b[32m..: cycles culture_life_once 123456\x1b[0m\n'
+              '..: cycles refresh_display 7890\n'
+              '..: state 0a0b\n'
+              '..: done\n')
+    cycles, state = benchmark.parse_output(output)
+    self.assertEqual({'culture_life_once': 123456,
+                      'refresh_display': 7890}, cycles)
+    self.assertEqual(b'\x0a\x0b', state)
+
+  def testIncompleteOutput(self):
+    with self.assertRaises(RuntimeError):
+      benchmark.parse_output('..: cycles refresh_display 7890\n')
+
+  def testUnpackState(self):
+    state = benchmark.reference_state(25)
+    self.assertEqual(apa102.NUM_DISC_LEDS, len(state))
+    self.assertLessEqual(max(state), benchmark.MAX_CULTURE_VALUE)
+    self.assertEqual(state, benchmark.unpack_state(_pack_state(state)))
+
+  def testGeneratedConfig(self):
+    self.assertEqual((sorted(reseed.LIBRARY[0]), (2,3), (2,5)),
+                     benchmark.generated_config())
+    with tempfile.TemporaryDirectory() as src_dir:
+      src_dir = pathlib.Path(src_dir)
+      seed = reseed.LIBRARY[3]  # As if generated from a bank.
+      for name, contents in generate_tables.generate(
+          (2,3), (3,), seeds=[seed, reseed.LIBRARY[0]]).items():
+        (src_dir / name).write_text(contents)
+      self.assertEqual((sorted(seed), (2,3), (3,)),
+                       benchmark.generated_config(src_dir))
+      self.assertNotEqual(benchmark.reference_state(5),
+                          benchmark.reference_state(5, src_dir))
+
+  @unittest.skipUnless(shutil.which('avr-g++') and shutil.which('simavr'),
+                       'needs avr-g++ and simavr')
+  def testFirmwareMatchesReference(self):
+    self.assertEqual(0, benchmark.main(['benchmark.py', '--generations', '5']))
+
+
+if __name__ == '__main__':
+  unittest.main()
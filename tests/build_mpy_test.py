@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+sys.path.insert(0, os.path.join(os.getcwd(), 'utils'))  # HACK
+import apa102
+import build_mpy
+import life
+import push2wipy
+
+
+class TestPackedNeighbors(unittest.TestCase):
+
+  def setUp(self):
+    self.packed = life.PackedNeighbors(life.pack_neighbors(life.DISC_NEIGHBORS))
+
+  def testSequence(self):
+    self.assertEqual(len(life.DISC_NEIGHBORS), len(self.packed))
+    self.assertEqual(list(life.DISC_NEIGHBORS),
+                     [bytes(leds) for leds in self.packed])
+    self.assertEqual(life.DISC_NEIGHBORS[100], self.packed[100])
+    with self.assertRaises(IndexError):
+      self.packed[len(self.packed)]
+    self.assertEqual(life.DISC_NEIGHBORS, self.packed.decode())
+
+  def testNextGeneration(self):
+    tuple_state = bytearray(apa102.NUM_DISC_LEDS)
+    for led in range(0, apa102.NUM_DISC_LEDS, 3):
+      tuple_state[led] = 1
+    packed_state = tuple_state
+    for _ in range(50):
+      tuple_state = life.next_generation(life.DISC_NEIGHBORS, tuple_state,
+                                         (2,3), (2,5), 7)
+      packed_state = life.next_generation(self.packed, packed_state,
+                                          (2,3), (2,5), 7)
+      self.assertEqual(tuple_state, packed_state)
+
+  def testLoadedByLife(self):
+    """life falls back to disc_neighbors.bin without disc_neighbors.py."""
+    with tempfile.TemporaryDirectory() as module_dir:
+      for module in build_mpy.MODULES:
+        if module != 'disc_neighbors':
+          shutil.copy(module + '.py', module_dir)
+      with open(os.path.join(module_dir, build_mpy.NEIGHBORS_DATA), 'wb') as data:
+        data.write(life.pack_neighbors(life.DISC_NEIGHBORS))
+      output = subprocess.check_output(
+          [sys.executable, '-c', 'import life; n = life.DISC_NEIGHBORS; '
+           'print(type(n).__name__, len(n), b"".join(n).hex())'],
+          cwd=module_dir, universal_newlines=True)
+    # Without viper kernels the table is decoded once for the Python step.
+    self.assertEqual('tuple 255 %s' % b''.join(life.DISC_NEIGHBORS).hex(),
+                     output.strip())
+
+
+class TestPush(unittest.TestCase):
+
+  def testStaleFiles(self):
+    existing = ['life.py', 'apa102.py', 'disc_neighbors.py', 'stats.mpy',
+                'patterns.py', 'patterns.bin', 'boot.py']
+    pushing = ['build/life.mpy', 'build/disc_neighbors.bin', 'build/stats.mpy',
+               'patterns.bin']
+    self.assertEqual(['disc_neighbors.py', 'life.py'],
+                     push2wipy.stale_files(existing, pushing))
+    self.assertEqual(['stats.mpy'],
+                     push2wipy.stale_files(existing, ['stats.py']))
+
+
+@unittest.skipUnless(shutil.which('mpy-cross'), 'needs mpy-cross')
+class TestBuild(unittest.TestCase):
+
+  def testBuild(self):
+    with tempfile.TemporaryDirectory() as out_dir:
+      names = build_mpy.build(out_dir, neighbors_data=True)
+      self.assertIn('life.mpy', names)
+      self.assertIn(build_mpy.NEIGHBORS_DATA, names)
+      self.assertIn('viper_kernels.py', names)
+      with open(os.path.join(out_dir, 'life.mpy'), 'rb') as mpy:
+        self.assertEqual(b'M', mpy.read(1))
+      if shutil.which('micropython'):
+        elapsed, peak, retained = build_mpy.measure_import('micropython',
+                                                           out_dir)
+        self.assertGreater(peak, 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
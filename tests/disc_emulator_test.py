@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+sys.path.insert(0, os.path.join(os.getcwd(), 'utils'))  # HACK
+import apa102
+import disc_emulator
+import life
+import reseed
+from apa102 import DISC_RINGS, DISC_RING_OFFSETS, NUM_DISC_LEDS
+
+
+class TestDecode(unittest.TestCase):
+
+  def testDecode(self):
+    data = (apa102.START_FRAME + b'\xe3\x01\x02\x03' + b'\xff\x10\x20\x30'
+            + apa102.FINISH_BYTE)
+    frame = disc_emulator.decode(data)
+    self.assertEqual(2, len(frame))
+    self.assertEqual((3, 3, 2, 1), frame.led(0))
+    self.assertEqual((31, 0x30, 0x20, 0x10), frame.led(1))
+
+  def testMalformed(self):
+    good = apa102.START_FRAME + apa102.led_off*4 + apa102.FINISH_BYTE
+    disc_emulator.decode(good)
+    with self.assertRaises(ValueError):
+      disc_emulator.decode(b'\x01' + good[1:])
+    with self.assertRaises(ValueError):
+      disc_emulator.decode(good[:-1])  # No finish byte.
+    with self.assertRaises(ValueError):
+      disc_emulator.decode(good[:4] + b'\x00' + good[5:])  # Bad LED header.
+    with self.assertRaises(ValueError):
+      disc_emulator.decode(good, num_leds=40)  # Not enough finish bytes.
+
+  def testWhiteLastLed(self):
+    disc = disc_emulator.DiscEmulator()
+    disc.write(apa102.START_FRAME + apa102.led_off*(NUM_DISC_LEDS-1)
+               + b'\xff'*4 + b'\xff'*apa102.num_finish_bytes(NUM_DISC_LEDS))
+    frame = disc.frame()
+    self.assertEqual(NUM_DISC_LEDS, len(frame))
+    self.assertEqual((31, 255, 255, 255), frame.led(NUM_DISC_LEDS-1))
+
+  def testDecodeSpeed(self):
+    disc = disc_emulator.DiscEmulator()
+    data = apa102.START_FRAME + apa102.cyan*NUM_DISC_LEDS + b'\xff'*15
+    for _ in range(3000):
+      disc.write(data)
+    start = time.monotonic()
+    frames = disc.frames()
+    elapsed = time.monotonic() - start
+    self.assertEqual(3000, len(frames))
+    self.assertLess(elapsed, 1.5)  # Thousands of frames per second.
+
+
+class TestEffects(unittest.TestCase):
+
+  def setUp(self):
+    self.disc = disc_emulator.DiscEmulator()
+    self._saved_spi = apa102.spi
+    apa102.spi = self.disc
+
+  def tearDown(self):
+    apa102.spi = self._saved_spi
+
+  def _run(self, frames, count):
+    for _, _ in zip(range(count), frames):
+      pass
+    return self.disc.frames()
+
+  def testTarget(self):
+    self.disc.num_leds = None  # target() also lights a strand.
+    frame = self._run(apa102._test_frames(apa102._target_data(2, 0),
+                                          NUM_DISC_LEDS, 0), 1)[-1]
+    for ring, color in zip(range(len(DISC_RINGS)), apa102.rainbow):
+      expected = disc_emulator.decode(apa102.START_FRAME
+                                      + apa102._brightness(color, 2)
+                                      + apa102.FINISH_BYTE)
+      for led in range(DISC_RING_OFFSETS[ring],
+                       DISC_RING_OFFSETS[ring] + DISC_RINGS[ring]):
+        self.assertEqual(expected.led(0), frame.led(led))
+
+  def testTargetRotates(self):
+    self.disc.num_leds = None
+    frames = self._run(apa102._test_frames(apa102._target_data(2, 0),
+                                           NUM_DISC_LEDS, 1), 3)
+    self.assertEqual(3, len(frames))
+    self.assertEqual(frames[0].led(1), frames[1].led(0))
+
+  def testCylon(self):
+    self.disc.num_leds = 5
+    frames = self._run(apa102._cylon_frames(0, 5, (apa102.red,), False), 8)
+    lit = [frame.lit().index(1) for frame in frames]
+    self.assertEqual([0, 1, 2, 3, 4, 3, 2, 1], lit)
+
+  def testPuddle(self):
+    frames = self._run(apa102._puddle_frames(3, 0, 0), len(DISC_RINGS))
+    # One ring changes color per frame, rippling inwards.
+    for ring in range(1, len(DISC_RINGS)):
+      start = DISC_RING_OFFSETS[ring]
+      end = start + DISC_RINGS[ring]
+      before, after = frames[ring-1], frames[ring]
+      self.assertNotEqual(before.led(start), after.led(start))
+      self.assertEqual({after.led(start)},
+                       {after.led(led) for led in range(start, end)})
+      self.assertEqual(before[:start].lit(), after[:start].lit())
+      self.assertEqual(before.red[end:], after.red[end:])
+
+  def testLifeRun(self):
+    sys.modules['machine'] = self.disc.machine()
+    try:
+      l = life.Life(reseeder=reseed.Reseeder(seed=1, log=None))
+      state = l.run(iterations=10, sleep_ms=0)
+    finally:
+      del sys.modules['machine']
+    frames = self.disc.frames()
+    self.assertEqual(10, len(frames))
+    # Frames show generations 0-9, run() returns generation 10.
+    shown = bytearray(frames[-1].lit())
+    expected = life.next_generation(l._neighbors, shown, (2,3), (2,5), 1)
+    self.assertEqual(expected, bytearray(1 if age else 0 for age in state))
+
+  def testRender(self):
+    self.disc.num_leds = None
+    self._run(apa102._test_frames(apa102._target_data(2, 0),
+                                  NUM_DISC_LEDS, 0), 1)
+    frame = self.disc.frame()
+    with tempfile.TemporaryDirectory() as tmp:
+      path = os.path.join(tmp, 'target.png')
+      disc_emulator.write_png(path, frame, 64, 64)
+      with open(path, 'rb') as png:
+        self.assertEqual(b'\x89PNG', png.read(4))
+    text = disc_emulator.render_terminal(frame, 20, 10)
+    self.assertEqual(10, len(text.splitlines()))
+    self.assertIn('\x1b[48;2;', text)
+
+
+class TestMain(unittest.TestCase):
+
+  def testEveryEffect(self):
+    saved_spi = apa102.spi
+    try:
+      for effect in ('target', 'puddle', 'cylon', 'color_chase', 'life'):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+          disc_emulator.main(['disc_emulator.py', effect, '--frames', '3'])
+        self.assertIn('\n3 frames\n', output.getvalue(), effect)
+    finally:
+      apa102.spi = saved_spi
+      sys.modules.pop('machine', None)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+sys.path.insert(0, os.path.join(os.getcwd(), 'utils'))  # HACK
+import apa102
+import disc_emulator
+import frametable
+
+
+class TestCompiledEffects(unittest.TestCase):
+
+  def setUp(self):
+    self.disc = disc_emulator.DiscEmulator()
+    self._saved_spi = apa102.spi
+    apa102.spi = self.disc
+
+  def tearDown(self):
+    apa102.spi = self._saved_spi
+
+  def _live_writes(self, frames, count):
+    for _, _ in zip(range(count), frames):
+      pass
+    writes = self.disc.writes
+    self.disc.writes = []
+    return writes
+
+  def _played_writes(self, table, periods):
+    for _ in range(periods):
+      apa102.play(table, sleep_ms=0, repeat=False)
+    writes = self.disc.writes
+    self.disc.writes = []
+    return writes
+
+  def _assertCompiledMatches(self, effect, frames, skip=0, **kwargs):
+    table = apa102.compile_effect(effect, **kwargs)
+    live = self._live_writes(frames, skip + 2*len(table))[skip:]
+    self.assertEqual(live, self._played_writes(table, 2))
+    return table
+
+  def testPuddle(self):
+    table = self._assertCompiledMatches(
+        'puddle', apa102._puddle_frames(3, 0, 0), skip=apa102.NUM_RINGS-1)
+    self.assertEqual(apa102.NUM_RINGS*5, len(table))
+
+  def testCylon(self):
+    colors = (apa102.red, apa102.blue)
+    table = self._assertCompiledMatches(
+        'cylon', apa102._cylon_frames(2, 9, colors, False),
+        start=2, end=9, colors=colors)
+    self.assertEqual(12, len(table))
+
+  def testTargetRotate(self):
+    table = self._assertCompiledMatches(
+        'target', apa102._test_frames(apa102._target_data(2, 3),
+                                      apa102.NUM_DISC_LEDS+3, 7),
+        offset=3, rotate=7)
+    self.assertEqual(apa102.NUM_DISC_LEDS+3+apa102.NUM_STRAND_LEDS, len(table))
+
+  def testStaticTarget(self):
+    table = apa102.compile_effect('target')
+    self.assertEqual(1, len(table))
+    self.disc.num_leds = None  # target() also lights a strand.
+    apa102.play(table, repeat=False)
+    expected = disc_emulator.decode(apa102.START_FRAME
+                                    + apa102._brightness(apa102.red, 2)
+                                    + apa102.FINISH_BYTE)
+    self.assertEqual(expected.led(0), self.disc.frame().led(0))
+
+  def testColorChase(self):
+    table = self._assertCompiledMatches(
+        'color_chase', apa102._test_frames(apa102._color_chase_data(), 0, 1))
+    self.assertEqual(apa102.NUM_DISC_LEDS, len(table))
+
+  def testPlaybackIsZeroCopy(self):
+    table = apa102.compile_effect('cylon', end=4)
+    frames = table.frames()
+    first = next(frames)
+    self.assertIsInstance(first, memoryview)
+    self.assertEqual(table.frame_size, len(first))
+    for _ in range(len(table) - 1):
+      next(frames)
+    self.assertEqual(first, next(frames))  # Loops back around.
+
+
+class TestFrameTableFiles(unittest.TestCase):
+
+  def setUp(self):
+    self.table = apa102.compile_effect('cylon', end=10)
+    self._tmp = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self._tmp.name, 'cylon.lcft')
+    self.table.save(self.path)
+
+  def tearDown(self):
+    self._tmp.cleanup()
+
+  def testLoad(self):
+    loaded = frametable.FrameTable.load(self.path)
+    self.assertEqual(len(self.table), len(loaded))
+    self.assertEqual(list(self.table.frames(False)),
+                     list(loaded.frames(False)))
+
+  def testFileFrameTable(self):
+    table = frametable.FileFrameTable(self.path)
+    try:
+      self.assertEqual(len(self.table), len(table))
+      self.assertEqual(self.table.frame(5), table.frame(5))
+      streamed = [bytes(frame) for frame in table.frames(False)]
+      self.assertEqual([bytes(frame) for frame in self.table.frames(False)],
+                       streamed)
+      with self.assertRaises(IndexError):
+        table.frame(len(table))
+    finally:
+      table.close()
+
+  def testBadFiles(self):
+    with open(self.path, 'rb') as table_file:
+      data = table_file.read()
+    for bad in (b'XXXX' + data[4:], data[:-1], data[:5]):
+      with open(self.path, 'wb') as table_file:
+        table_file.write(bad)
+      with self.assertRaises(ValueError):
+        frametable.FrameTable.load(self.path)
+
+  def testCompileShortEffect(self):
+    with self.assertRaises(ValueError):
+      frametable.FrameTable.compile(iter([b'1234']), 2)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+sys.path.insert(0, os.path.join(os.getcwd(), '8bit'))  # HACK
+import generate_tables
+import life
+import patterns
+import reseed
+
+
+class TestGenerateTables(unittest.TestCase):
+
+  def testNeighborEncodingRoundTrips(self):
+    codes = generate_tables.encode_neighbors()
+    self.assertEqual(len(life.DISC_NEIGHBORS), len(codes))
+    self.assertEqual(life.DISC_NEIGHBORS,
+                     generate_tables.decode_neighbors(codes))
+
+  def testRejectsUnencodableTopology(self):
+    neighbors = list(life.DISC_NEIGHBORS)
+    neighbors[0] += b'\x50'  # A second, non-adjacent, inner ring neighbor.
+    with self.assertRaises(ValueError):
+      generate_tables.encode_neighbors(neighbors)
+
+  def testReproducible(self):
+    self.assertEqual(generate_tables.generate(), generate_tables.generate())
+
+  def testCheckedInSourcesAreCurrent(self):
+    for name, contents in generate_tables.generate().items():
+      with open(generate_tables.SRC_DIR / name, newline='') as source:
+        self.assertEqual(contents, source.read(),
+                         name + ' is stale, run 8bit/generate_tables.py')
+
+  def testRules(self):
+    header = generate_tables.generate((3,), (2,3))['led_disc_config.h']
+    self.assertIn('#define LIFE_STAY_ALIVE_MASK 0x08\n', header)
+    self.assertIn('#define LIFE_NEW_BORN_MASK 0x0c\n', header)
+
+  def testRequiresSeeds(self):
+    with self.assertRaises(ValueError):
+      generate_tables.generate(seeds=())
+    bank = patterns.encode_bank([
+        patterns.encode_record(reseed.LIBRARY[0], 3000, 0, (2,3), (2,5))])
+    with tempfile.NamedTemporaryFile(suffix='.bin') as bank_file:
+      bank_file.write(bank)
+      bank_file.flush()
+      with self.assertRaises(SystemExit):  # Nothing scored under (3,)/(3,).
+        generate_tables.main(['generate_tables.py', '--stay-alive', '3',
+                              '--new-born', '3', '--bank', bank_file.name])
+
+
+if __name__ == '__main__':
+  unittest.main()
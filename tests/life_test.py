@@ -3,15 +3,18 @@
 
 """This unittest runs on actual Python 3, not MicroPython."""
 
+import collections
 import os
 import pprint
 import sys
 import time
+import types
 import unittest
 
 sys.path.insert(0, os.getcwd())  # HACK
 import apa102
 import life
+import stats
 
 
 class MockWiPySPI(object):
@@ -55,6 +58,80 @@ class TestLife(unittest.TestCase):
     l.make_torus()
     pprint.pprint(l.run(initial_state=[254], iterations=5, sleep_ms=0))
 
+  def testReseedShowsRightAfterPause(self):
+    events = []
+    l = life.Life()
+    l.spi = types.SimpleNamespace(write=lambda data: events.append('write'))
+    saved_sleep_ms = time.sleep_ms
+    time.sleep_ms = lambda ms: events.append(ms)
+    try:
+      l.run(initial_state=[0], iterations=3, sleep_ms=10)  # Dies at once.
+    finally:
+      time.sleep_ms = saved_sleep_ms
+    pause = events.index(1000+10*3)
+    self.assertEqual('write', events[pause-2])  # The dead frame, then a wait.
+    self.assertEqual('write', events[pause+1])
+
+
+class TestGenerations(unittest.TestCase):
+
+  def testMatchesRun(self):
+    l = life.Life()
+    states = l.generations(stay_alive=(2,3), new_born=(2,5), max_alive=7)
+    for _ in range(40):
+      state = next(states)
+    self.assertEqual(l.run(iterations=39, sleep_ms=0), state)
+
+  def testReuse(self):
+    l = life.Life()
+    copied = l.generations(max_alive=3)
+    reused = l.generations(max_alive=3, reuse=True)
+    buffers = set()
+    for _ in range(100):
+      state = next(reused)
+      buffers.add(id(state))
+      self.assertEqual(next(copied), state)
+    self.assertEqual(2, len(buffers))
+
+  def testInPlaceChangesCarryForward(self):
+    l = life.Life()
+    states = l.generations(initial_state=[0], reuse=True)
+    state = next(states)
+    self.assertEqual(0, max(next(states)))  # A lone cell dies.
+    state = next(states)
+    for led in range(0, 48, 2):
+      state[led] = 1  # Every other outer LED has two live neighbors.
+    self.assertEqual(1, next(states)[1])
+
+  def testDetectCycles(self):
+    life_stats = stats.LifeStats()
+    blinker = [bytearray(b'\x01\x00'), bytearray(b'\x00\x01'),
+               bytearray(b'\x01\x01')]
+    states = ([bytearray(b'\x01\x01')] + blinker*20 +  # Period 3.
+              [bytearray(2)] +  # Died, then a reseed into a still life.
+              [bytearray(b'\x01\x00')]*5)
+    seen = list(life.detect_cycles(iter(states), life_stats))
+    self.assertEqual(states, seen)
+    self.assertEqual(2, life_stats.cyclic)
+
+  def testRecord(self):
+    history = collections.deque((), 3)
+    states = life.record(life.Life().generations(reuse=True), history)
+    last = [bytes(next(states)) for _ in range(5)][-3:]
+    self.assertEqual(last, list(history))
+
+  def testDisplayed(self):
+    writes = []
+    l = life.Life()
+    l.spi = types.SimpleNamespace(write=lambda data: writes.append(bytes(data)))
+    states = l.displayed(l.generations(), alive=(apa102.white,))
+    state = next(states)
+    self.assertEqual(1, len(writes))
+    lit = apa102._brightness(apa102.white, l.brightness)
+    led = l._default_start_state[0]
+    self.assertEqual(lit, writes[0][4+led*4:8+led*4])
+    self.assertEqual(1, state[led])
+
 
 def emit_c_struct_of_neighbors(calculated_neighbors):
   if len(calculated_neighbors) > 255:
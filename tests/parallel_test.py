@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+import apa102
+import life
+import parallel
+import reseed
+
+from life_test import MockWiPyMachine
+
+
+_saved_sleep_ms = []
+
+
+def setUpModule():
+  assert 'machine' not in sys.modules
+  sys.modules['machine'] = MockWiPyMachine
+  if hasattr(time, 'sleep_ms'):
+    _saved_sleep_ms.append(time.sleep_ms)
+  time.sleep_ms = lambda ms: None  # Skip the pause after each dieoff.
+
+
+def tearDownModule():
+  del sys.modules['machine']
+  del time.sleep_ms
+  if _saved_sleep_ms:
+    time.sleep_ms = _saved_sleep_ms.pop()
+
+
+def _serial(neighbors, initial_state, generations, **rules):
+  state = bytearray(len(neighbors))
+  for led in initial_state:
+    state[led] = 1
+  states = [bytes(state)]
+  for _ in range(generations):
+    state = life.py_next_generation(neighbors, state, rules['stay_alive'],
+                                    rules['new_born'], rules['max_alive'])
+    states.append(bytes(state))
+  return states
+
+
+def _seed(copies):
+  return [disc * apa102.NUM_DISC_LEDS + led
+          for disc in range(copies) for led in reseed.LIBRARY[disc % 5]]
+
+
+class TestPartition(unittest.TestCase):
+
+  def testSectors(self):
+    neighbors = parallel.chained_neighbors(copies=3)
+    sectors = parallel.partition(neighbors, 4)
+    self.assertEqual(4, len(sectors))
+    self.assertEqual(0, sectors[0].start)
+    self.assertEqual(len(neighbors), sectors[-1].end)
+    for before, after in zip(sectors, sectors[1:]):
+      self.assertEqual(before.end, after.start)
+    sizes = [sector.end - sector.start for sector in sectors]
+    self.assertLess(max(sizes) - min(sizes), 30)
+
+  def testHalo(self):
+    sector = parallel.partition(life.DISC_NEIGHBORS, 3)[1]
+    expected = {neighbor for led in range(sector.start, sector.end)
+                for neighbor in life.DISC_NEIGHBORS[led]
+                if not sector.start <= neighbor < sector.end}
+    self.assertEqual(expected, set(sector.halo))
+    self.assertEqual(len(expected), len(sector.halo))
+    # Local numbering maps back onto the real topology.
+    local_to_led = list(range(sector.start, sector.end)) + list(sector.halo)
+    for led in range(sector.start, sector.end):
+      self.assertEqual(
+          life.DISC_NEIGHBORS[led],
+          bytes(local_to_led[local]
+                for local in sector.neighbors[led - sector.start]))
+
+  def testChainedNeighbors(self):
+    neighbors = parallel.chained_neighbors(copies=3)
+    self.assertEqual(3 * apa102.NUM_DISC_LEDS, len(neighbors))
+    middle = apa102.NUM_DISC_LEDS
+    self.assertIn(5, neighbors[middle + 5])
+    self.assertIn(2 * middle + 5, neighbors[middle + 5])
+    self.assertEqual(tuple(life.DISC_NEIGHBORS[5]) + (middle + 5,),
+                     neighbors[5])
+    self.assertEqual(tuple(middle + led for led in life.DISC_NEIGHBORS[100]),
+                     neighbors[middle + 100])  # Only outer rings link.
+
+
+class TestParallelLife(unittest.TestCase):
+
+  def _assertMatchesSerial(self, neighbors, num_sectors, processes,
+                           generations=25, **rules):
+    rules.setdefault('stay_alive', (2,3))
+    rules.setdefault('new_born', (2,5))
+    rules.setdefault('max_alive', 7)
+    initial_state = _seed(len(neighbors) // apa102.NUM_DISC_LEDS or 1)
+    expected = _serial(neighbors, initial_state, generations, **rules)
+    engine = parallel.ParallelLife(neighbors, num_sectors,
+                                   processes=processes, **rules)
+    with contextlib.closing(engine.generations(initial_state)) as states:
+      actual = [bytes(state) for _, state in zip(expected, states)]
+    self.assertEqual(expected, actual)
+
+  def testThreadsDisc(self):
+    for num_sectors in (1, 2, 3, 5):
+      self._assertMatchesSerial(life.DISC_NEIGHBORS, num_sectors, False)
+
+  def testThreadsTorusRules(self):
+    l = life.Life.__new__(life.Life)
+    l._neighbors, l.shape = life.DISC_NEIGHBORS, 'disc'
+    l.make_torus()
+    self._assertMatchesSerial(l._neighbors, 4, False, stay_alive=(2,3),
+                              new_born=(3,), max_alive=1)
+
+  def testThreadsChained(self):
+    self._assertMatchesSerial(parallel.chained_neighbors(copies=6), 4, False,
+                              generations=10)
+
+  def testProcessesChained(self):
+    self._assertMatchesSerial(parallel.chained_neighbors(copies=4), 3, True,
+                              generations=10)
+
+  def testWorkersStop(self):
+    running = threading.active_count()
+    engine = parallel.ParallelLife(life.DISC_NEIGHBORS, 3)
+    states = engine.generations(reseed.LIBRARY[0])
+    next(states)
+    next(states)
+    self.assertEqual(running + 2, threading.active_count())
+    states.close()
+    self.assertEqual(running, threading.active_count())
+
+
+class TestLifeSectors(unittest.TestCase):
+
+  def testGenerations(self):
+    l = life.Life()
+    for reuse in (False, True):
+      serial = l.generations(max_alive=3, reuse=reuse)
+      sectored = l.generations(max_alive=3, reuse=reuse, sectors=3)
+      with contextlib.closing(sectored):
+        for _ in range(30):
+          self.assertEqual(next(serial), next(sectored))
+
+  def testInPlaceChangesCarryForward(self):
+    l = life.Life()
+    for reuse in (False, True):
+      with contextlib.closing(l.generations(initial_state=[0], reuse=reuse,
+                                            sectors=2)) as states:
+        next(states)
+        state = next(states)
+        self.assertEqual(0, max(state))  # A lone cell dies.
+        for led in range(0, 48, 2):
+          state[led] = 1  # Every other outer LED has two live neighbors.
+        self.assertEqual(1, next(states)[1])
+
+  def testRunReseeds(self):
+    running = threading.active_count()
+    results = []
+    for sectors, processes in ((1, False), (2, False), (2, True)):
+      l = life.Life(reseeder=reseed.Reseeder(seed=9, log=None))
+      state = l.run(initial_state=[0], iterations=50, sleep_ms=0,
+                    stay_alive=(), new_born=(3,), sectors=sectors,
+                    processes=processes)
+      results.append((state, l.stats.dieoffs))
+    self.assertEqual([results[0]]*3, results)
+    self.assertGreater(results[0][1], 1)
+    self.assertEqual(running, threading.active_count())
+
+
+if __name__ == '__main__':
+  unittest.main()
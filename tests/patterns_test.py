@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+sys.path.insert(0, os.path.join(os.getcwd(), 'utils'))  # HACK
+import build_pattern_bank
+import patterns
+import reseed
+
+
+def _sample_bank():
+  return patterns.encode_bank([
+      patterns.encode_record(reseed.LIBRARY[0], 3000, 0, (2,3), (2,5)),
+      patterns.encode_record((0, 7, 8, 254), 40, 2, (2,3), (3,)),
+  ])
+
+
+class TestPatternBank(unittest.TestCase):
+
+  def testRoundTrip(self):
+    data = _sample_bank()
+    self.assertEqual(8 + 2*patterns.RECORD_SIZE, len(data))
+    bank = patterns.PatternBank(data)
+    self.assertEqual(2, len(bank))
+    self.assertEqual(sorted(reseed.LIBRARY[0]), bank.cells(0))
+    self.assertEqual([0, 7, 8, 254], bank.cells(1))
+    self.assertEqual((3000, 0, (2,3), (2,5)), bank.meta(0))
+    self.assertEqual((40, 2, (2,3), (3,)), bank.meta(1))
+    self.assertEqual(b'\x81\x01', bytes(bank.bitset(1)[:2]))
+    with self.assertRaises(IndexError):
+      bank.cells(2)
+
+  def testMatching(self):
+    bank = patterns.PatternBank(_sample_bank())
+    self.assertEqual([0], bank.matching((2,3), (2,5)))
+    self.assertEqual([1], bank.matching((3,2), (3,)))
+    self.assertEqual([], bank.matching((1,), (1,)))
+
+  def testRejectsBadData(self):
+    data = bytearray(_sample_bank())
+    with self.assertRaises(ValueError):
+      patterns.PatternBank(data[:-1])
+    data[0:4] = b'XXXX'
+    with self.assertRaises(ValueError):
+      patterns.PatternBank(data)
+
+  def testReseedFromBank(self):
+    bank = patterns.PatternBank(_sample_bank())
+    reseeder = reseed.Reseeder(seed=5, strategies=('bank',), bank=bank,
+                               log=None)
+    reseeder.rules = ((2,3), (3,))
+    scored = [sorted(reseed.rotate(bank.cells(1), turns)) for turns in (0, 2)]
+    for _ in range(20):  # Only ever the cells scored, or a half turn.
+      self.assertIn(sorted(reseed.bank(reseeder.rng, reseeder)), scored)
+    reseeder.rules = ((1,), (1,))  # Nothing matching, use the library.
+    self.assertGreater(len(reseed.bank(reseeder.rng, reseeder)), 4)
+
+
+class TestBuildPatternBank(unittest.TestCase):
+
+  def testBuild(self):
+    data = build_pattern_bank.build(num_candidates=20, keep=3,
+                                    generations=200, seed=1,
+                                    stay_alive=(2,3), new_born=(2,5))
+    self.assertEqual(data, build_pattern_bank.build(20, 3, 200, 1,
+                                                    (2,3), (2,5)))
+    bank = patterns.PatternBank(data)
+    self.assertEqual(3, len(bank))
+    lifetimes = [bank.meta(idx)[0] for idx in range(3)]
+    self.assertEqual(sorted(lifetimes, reverse=True), lifetimes)
+    self.assertEqual(200, lifetimes[0])  # The library seeds outlive it.
+
+
+if __name__ == '__main__':
+  unittest.main()
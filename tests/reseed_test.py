@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+import apa102
+import life
+import reseed
+
+from life_test import MockWiPyMachine
+
+
+_saved_sleep_ms = []
+
+
+def setUpModule():
+  assert 'machine' not in sys.modules
+  sys.modules['machine'] = MockWiPyMachine
+  if hasattr(time, 'sleep_ms'):
+    _saved_sleep_ms.append(time.sleep_ms)
+  time.sleep_ms = lambda ms: None  # Skip the pause after each dieoff.
+
+
+def tearDownModule():
+  del sys.modules['machine']
+  del time.sleep_ms
+  if _saved_sleep_ms:
+    time.sleep_ms = _saved_sleep_ms.pop()
+
+
+class TestXorShift32(unittest.TestCase):
+
+  def testKnownSequence(self):
+    rng = reseed.XorShift32(1)
+    self.assertEqual([270369, 67634689, 2647435461],
+                     [rng.next() for _ in range(3)])
+
+  def testZeroSeedIsUsable(self):
+    rng = reseed.XorShift32(0)
+    self.assertNotEqual(0, rng.next())
+
+  def testBelow(self):
+    rng = reseed.XorShift32(42)
+    values = [rng.below(255) for _ in range(5000)]
+    self.assertEqual(0, min(values))
+    self.assertEqual(254, max(values))
+
+
+class TestReseeder(unittest.TestCase):
+
+  def testStrategiesStayOnTheDisc(self):
+    reseeder = reseed.Reseeder(seed=7, log=None)
+    long_lived = bytearray(apa102.NUM_DISC_LEDS)
+    for led in reseed.LIBRARY[1]:
+      long_lived[led] = 1
+    reseeder.last_long_lived = bytes(long_lived)
+    for name, strategy in sorted(reseed.STRATEGIES.items()):
+      for _ in range(50):
+        leds = strategy(reseeder.rng, reseeder)
+        self.assertTrue(leds, name)
+        for led in leds:
+          self.assertTrue(0 <= led < apa102.NUM_DISC_LEDS, (name, led))
+
+  def testRotatePreservesRings(self):
+    ring_0 = list(range(apa102.DISC_RINGS[0]))
+    self.assertEqual(ring_0[12:] + ring_0[:12], reseed.rotate(ring_0, 1))
+    self.assertEqual([254], reseed.rotate([254], 3))
+
+  def testHalfTurnPreservesAdjacency(self):
+    rotated = reseed.rotate(range(apa102.NUM_DISC_LEDS), 2)
+    for led, neighbors in enumerate(life.DISC_NEIGHBORS):
+      self.assertEqual(sorted(life.DISC_NEIGHBORS[rotated[led]]),
+                       sorted(rotated[neighbor] for neighbor in neighbors))
+
+  def testSymmetricSeedsPreserveAdjacency(self):
+    reseeder = reseed.Reseeder(seed=5, log=None)
+    for _ in range(20):
+      for name in ('library', 'ring_symmetric'):
+        leds = reseed.STRATEGIES[name](reseeder.rng, reseeder)
+        if name == 'ring_symmetric':
+          self.assertEqual(sorted(leds), sorted(reseed.rotate(leds, 2)))
+        else:
+          self.assertIn(sorted(leds), [sorted(reseed.rotate(pattern, turns))
+                                       for pattern in reseed.LIBRARY
+                                       for turns in (0, 2)])
+
+  def testLoggedReseedCanBeReplayed(self):
+    messages = []
+    reseeder = reseed.Reseeder(seed=0xc0ffee, log=messages.append)
+    self.assertEqual(['reseed init seed=0x00c0ffee'], messages)
+    rng = reseed.XorShift32(9)
+    long_lived = bytes(rng.below(2) for _ in range(apa102.NUM_DISC_LEDS))
+    reseeder.last_long_lived = long_lived
+    states = []
+    for _ in range(20):
+      states.append(bytearray(apa102.NUM_DISC_LEDS))
+      reseeder.reseed(states[-1])
+    replayer = reseed.Reseeder(log=None)
+    replayer.last_long_lived = long_lived  # mutate_last needs the same one.
+    strategies = set()
+    for message, state in zip(messages[1:], states):
+      _, _, strategy, seed = message.split()
+      strategies.add(strategy)
+      replayed = bytearray(apa102.NUM_DISC_LEDS)
+      replayer.replay(replayed, int(seed[5:], 16), strategy)
+      self.assertEqual(state, replayed, message)
+    self.assertEqual(set(reseeder.strategies), strategies)
+
+  def testMutatesLastLongLived(self):
+    reseeder = reseed.Reseeder(seed=3, strategies=('mutate_last',), log=None)
+    reseeder.record(bytes(10) + b'\x01')
+    reseeder.died(10)
+    self.assertIsNone(reseeder.last_long_lived)
+    reseeder.died(1000)
+    self.assertEqual(bytes(10) + b'\x01', reseeder.last_long_lived)
+
+  def testUnknownStrategy(self):
+    with self.assertRaises(ValueError):
+      reseed.Reseeder(strategies=('nope',), log=None)
+
+
+class TestLifeReseeding(unittest.TestCase):
+
+  def _run(self, seed):
+    messages = []
+    reseeder = reseed.Reseeder(seed=seed, long_lived_rounds=1,
+                               log=messages.append)
+    l = life.Life(reseeder=reseeder)
+    # Nothing survives or is born under these rules so every culture dies
+    # after one generation, exercising many reseeds.
+    state = l.run(initial_state=[0], iterations=40, sleep_ms=0,
+                  stay_alive=(), new_born=())
+    return state, messages
+
+  def testRunIsReproducible(self):
+    state_a, log_a = self._run(1234)
+    state_b, log_b = self._run(1234)
+    self.assertGreater(len(log_a), 10)
+    self.assertEqual(log_a, log_b)
+    self.assertEqual(state_a, state_b)
+
+
+if __name__ == '__main__':
+  unittest.main()
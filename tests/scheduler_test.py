@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import asyncio
+import importlib
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+import apa102
+import life
+import scheduler
+
+from life_test import MockWiPyMachine
+
+
+_saved_time_attrs = {}
+
+
+def setUpModule():
+  assert 'machine' not in sys.modules
+  sys.modules['machine'] = MockWiPyMachine
+  # Other tests stub out time; these ones need a real clock.
+  for name in ('sleep_ms', 'ticks_ms'):
+    if hasattr(time, name):
+      _saved_time_attrs[name] = getattr(time, name)
+  time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+  time.ticks_ms = lambda: int(time.monotonic() * 1000)
+
+
+def tearDownModule():
+  del sys.modules['machine']
+  del time.sleep_ms, time.ticks_ms
+  for name, value in _saved_time_attrs.items():
+    setattr(time, name, value)
+
+
+async def _busy_task(stop, chunk_ms=3):
+  """Hog the CPU in chunks, yielding to the event loop between them."""
+  while not stop:
+    time.sleep(chunk_ms / 1000)  # Blocking, like a slow I2C transfer.
+    await asyncio.sleep(0)
+
+
+class TestFrameScheduler(unittest.TestCase):
+
+  def testZeroPeriodNeverWaits(self):
+    pacer = scheduler.FrameScheduler(0)
+    pacer.start()
+    for _ in range(100):
+      pacer.wait_blocking()
+    self.assertEqual(0, pacer.late_frames)
+
+  def testResyncsAfterFallingBehind(self):
+    pacer = scheduler.FrameScheduler(5)
+    pacer.start()
+    time.sleep(0.02)
+    pacer.wait_blocking()
+    self.assertEqual(1, pacer.late_frames)
+    self.assertGreater(pacer.remaining_ms(), 0)
+
+  def testBlockingWithoutAsyncio(self):
+    hidden = {name: sys.modules.get(name) for name in ('asyncio', 'uasyncio')}
+    try:
+      sys.modules.update(dict.fromkeys(hidden))  # None makes imports fail.
+      importlib.reload(scheduler)
+      self.assertIsNone(scheduler.asyncio)
+      scheduler.run_frames(range(3), 0)
+    finally:
+      for name, module in hidden.items():
+        if module is None:
+          del sys.modules[name]
+        else:
+          sys.modules[name] = module
+      importlib.reload(scheduler)
+    self.assertIs(asyncio, scheduler.asyncio)
+
+  def testJitterBoundedUnderBusyTask(self):
+    period_ms = 40
+    num_frames = 20
+    stop = []
+    lateness = []
+
+    async def frames():
+      pacer = scheduler.FrameScheduler(period_ms)
+      pacer.start()
+      first = pacer.deadline
+      for _ in range(num_frames):
+        deadline = pacer.deadline
+        await pacer.wait()
+        lateness.append(scheduler.ticks_diff(scheduler.ticks_ms(), deadline))
+      stop.append(True)
+      return scheduler.ticks_diff(scheduler.ticks_ms(), first)
+
+    async def main():
+      busy = asyncio.ensure_future(_busy_task(stop))
+      elapsed = await frames()
+      await busy
+      return elapsed
+
+    elapsed = asyncio.run(main())
+    # Never early, typically late by only a few busy chunks, and never
+    # so late that a frame is dropped.
+    self.assertGreaterEqual(min(lateness), 0)
+    self.assertLess(sorted(lateness)[num_frames//2], 12, lateness)
+    self.assertLess(max(lateness), period_ms, lateness)
+    # Deadlines advance by whole periods, lateness does not accumulate.
+    self.assertLess(elapsed, (num_frames+1) * period_ms, lateness)
+
+
+class TestAsyncEffects(unittest.TestCase):
+
+  def testRunAsyncMatchesRun(self):
+    l = life.Life()
+    expected = l.run(iterations=20, sleep_ms=0)
+    actual = asyncio.run(l.run_async(iterations=20, sleep_ms=0))
+    self.assertEqual(expected, actual)
+
+  def testEffectsCooperate(self):
+    ticks = []
+
+    async def ticker():
+      while True:
+        ticks.append(time.monotonic())
+        await asyncio.sleep(0.001)
+
+    async def main():
+      tick_task = asyncio.ensure_future(ticker())
+      effects = [apa102.cylon_async(sleep_ms=2),
+                 apa102.puddle_async(sleep_ms=2),
+                 apa102.color_chase_async(),
+                 apa102.target_async(rotate=1, sleep_ms=2)]
+      for effect in effects:
+        with self.assertRaises(asyncio.TimeoutError):
+          await asyncio.wait_for(effect, 0.05)
+      tick_task.cancel()
+
+    asyncio.run(main())
+    self.assertGreater(len(ticks), 50)
+
+
+if __name__ == '__main__':
+  unittest.main()
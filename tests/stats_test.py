@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython."""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+import life
+import reseed
+import stats
+
+from life_test import MockWiPyMachine
+
+
+class FakeTextDisplay(object):
+  """Records what would be drawn on an SSD1306 style text display."""
+  def __init__(self, display_ms=0, fail=False):
+    self.rows = [[' ']*21 for _ in range(4)]
+    self.cursor = (0, 0)
+    self.writes = []
+    self.pushes = 0
+    self.display_ms = display_ms
+    self.fail = fail
+  def clear(self):
+    self.rows = [[' ']*21 for _ in range(4)]
+  def set_cursor(self, col, row):
+    self.cursor = (col, row)
+  set_text_cursor = set_cursor
+  def write(self, text):
+    self.writes.append(text)
+    col, row = self.cursor
+    for char in text:
+      if char == '\n':
+        col, row = 0, row+1
+        continue
+      self.rows[row][col] = char
+      col += 1
+    self.cursor = (col, row)
+  def display(self):
+    if self.fail:
+      raise OSError('I2C bus error')
+    if self.display_ms:
+      time.sleep(self.display_ms / 1000)
+    self.pushes += 1
+  def text(self, row):
+    return ''.join(self.rows[row]).rstrip()
+
+
+class TestStatsRenderer(unittest.TestCase):
+
+  def setUp(self):
+    # Other tests stub out time; these ones need a real clock.
+    self._saved_ticks_ms = getattr(time, 'ticks_ms', None)
+    time.ticks_ms = lambda: int(time.monotonic() * 1000)
+    self.display = FakeTextDisplay()
+    self.renderer = stats.StatsRenderer(self.display, initial_cost_ms=5)
+    self.renderer.start()
+    self.stats = stats.LifeStats()
+
+  def tearDown(self):
+    if self._saved_ticks_ms:
+      time.ticks_ms = self._saved_ticks_ms
+    else:
+      del time.ticks_ms
+
+  def testRedrawsOnlyChangedDigits(self):
+    self.stats.rounds = 1099
+    self.renderer.render(self.stats, 100)
+    del self.display.writes[:]
+    self.stats.rounds = 1100
+    self.renderer.render(self.stats, 100)
+    self.assertEqual(['100'], self.display.writes)
+    del self.display.writes[:]
+    self.stats.rounds = 1101
+    self.renderer.render(self.stats, 100)
+    self.assertEqual(['1'], self.display.writes)
+    self.assertEqual(' Rounds alive: 1101', self.display.text(0))
+    self.stats.rounds = 7
+    self.renderer.render(self.stats, 100)
+    self.assertEqual(' Rounds alive: 7', self.display.text(0))
+
+  def testRateLimited(self):
+    self.assertTrue(self.renderer.render(self.stats, 100))
+    self.stats.rounds += 1
+    self.assertFalse(self.renderer.render(self.stats, 100))
+    self.assertEqual(1, self.display.pushes)
+
+  def testDieoffPushedImmediately(self):
+    self.assertTrue(self.renderer.render(self.stats, 100))
+    self.stats.dieoffs += 1
+    self.assertTrue(self.renderer.render(self.stats, 100))
+    self.assertEqual('Total dieoffs: 1', self.display.text(2))
+
+  def testNeverExceedsBudget(self):
+    self.display.display_ms = 20
+    self.renderer.cost_ms = 1
+    self.assertTrue(self.renderer.render(self.stats, 10))
+    self.assertGreaterEqual(self.renderer.cost_ms, 20)
+    self.stats.dieoffs += 1
+    self.assertFalse(self.renderer.render(self.stats, 10))
+    self.assertTrue(self.renderer.render(self.stats, 50))
+
+  def testDisplayErrorDisables(self):
+    self.display.fail = True
+    self.assertFalse(self.renderer.render(self.stats, 100))
+    self.assertIsNone(self.renderer.display)
+    self.assertFalse(self.renderer.render(self.stats, 100))
+
+
+class TestLifeStats(unittest.TestCase):
+
+  def setUp(self):
+    assert 'machine' not in sys.modules
+    sys.modules['machine'] = MockWiPyMachine
+    self._saved_sleep_ms = getattr(time, 'sleep_ms', None)
+    time.sleep_ms = lambda ms: None  # Skip the pause after each dieoff.
+
+  def tearDown(self):
+    del sys.modules['machine']
+    if self._saved_sleep_ms:
+      time.sleep_ms = self._saved_sleep_ms
+    else:
+      del time.sleep_ms
+
+  def testRunCollectsStats(self):
+    display = FakeTextDisplay()
+    # A fixed seed so the reseeded culture reliably outlives the run.
+    l = life.Life(stats_display=display,
+                  reseeder=reseed.Reseeder(seed=1, log=None))
+    l.run(initial_state=[0], iterations=5, sleep_ms=0)
+    self.assertEqual(5, l.stats.rounds)
+    self.assertEqual(1, l.stats.dieoffs)
+    self.assertEqual('Total dieoffs: 1', display.text(2))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# vim: set sw=2 ai expandtab
+
+"""This unittest runs on actual Python 3, not MicroPython.
+
+The viper kernels are loaded with their pointer types emulated so that
+their logic can be checked against the pure Python versions here.  The
+real viper code is exercised when a micropython binary is on the PATH.
+"""
+
+import importlib.util
+import os
+import random
+import shutil
+import subprocess
+import sys
+import types
+import unittest
+
+sys.path.insert(0, os.getcwd())  # HACK
+import apa102
+import life
+
+
+class _Ptr16(object):
+  def __init__(self, buf):
+    self._buf = buf
+
+  def __getitem__(self, idx):
+    return self._buf[2*idx] | self._buf[2*idx+1] << 8
+
+
+def _load_emulated_kernels():
+  fake_micropython = types.ModuleType('micropython')
+  fake_micropython.viper = lambda func: func
+  sys.modules['micropython'] = fake_micropython
+  try:
+    spec = importlib.util.spec_from_file_location(
+        'emulated_viper_kernels', os.path.join(os.getcwd(), 'viper_kernels.py'))
+    kernels = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(kernels)
+  finally:
+    del sys.modules['micropython']
+  kernels.ptr8 = lambda buf: buf
+  kernels.ptr16 = _Ptr16
+  return kernels
+
+
+def _torus_neighbors():
+  neighbors = list(life.DISC_NEIGHBORS)
+  for outer_led in range(apa102.DISC_RINGS[0]):
+    neighbors[outer_led] += b'\xfe'
+  neighbors[0xfe] += bytes(range(apa102.DISC_RINGS[0]))
+  return neighbors
+
+
+class TestKernelEquivalence(unittest.TestCase):
+
+  def setUp(self):
+    self.kernels = _load_emulated_kernels()
+    self._saved_kernels = life.viper_kernels, apa102.viper_kernels
+    life.viper_kernels = apa102.viper_kernels = self.kernels
+
+  def tearDown(self):
+    life.viper_kernels, apa102.viper_kernels = self._saved_kernels
+
+  def testCPythonUsesPurePython(self):
+    self.assertIs(life.py_next_generation, life.next_generation)
+    self.assertIs(life.py_fill_leds, life.fill_leds)
+    self.assertIs(life.py_palette_colors, life.palette_colors)
+    self.assertIs(apa102._py_inplace_normalize_led,
+                  apa102._inplace_normalize_led)
+
+  def testPackNeighbors(self):
+    table = life.pack_neighbors(life.DISC_NEIGHBORS)
+    starts = _Ptr16(table)
+    for led, neighbors in enumerate(life.DISC_NEIGHBORS):
+      self.assertEqual(neighbors, table[starts[led]:starts[led+1]])
+    self.assertEqual(len(table), starts[len(life.DISC_NEIGHBORS)])
+
+  def testNextGeneration(self):
+    rng = random.Random(5)
+    for neighbors in (life.DISC_NEIGHBORS, _torus_neighbors()):
+      for stay_alive, new_born, max_alive in (((2,3), (2,5), 7),
+                                              ((2,3), (3,), 1),
+                                              ((1,2,6), (0,4), 3)):
+        py_state = bytearray(rng.randrange(2) for _ in range(len(neighbors)))
+        viper_state = py_state
+        for _ in range(30):
+          py_state = life.py_next_generation(neighbors, py_state, stay_alive,
+                                             new_born, max_alive)
+          viper_state = life.viper_next_generation(
+              neighbors, viper_state, stay_alive, new_born, max_alive)
+          self.assertEqual(py_state, viper_state)
+
+  def testFillLeds(self):
+    palette = b''.join(apa102._brightness(color, 4)
+                       for color in [apa102.led_off] + life.orig)
+    rng = random.Random(7)
+    state = bytes(rng.randrange(len(life.orig) + 1)
+                  for _ in range(apa102.NUM_DISC_LEDS))
+    py_out = bytearray(apa102.NUM_DISC_LEDS*4 + 24)
+    viper_out = bytearray(py_out)
+    life.py_fill_leds(py_out, 8, state, life.py_palette_colors(palette))
+    self.kernels.fill_leds(viper_out, 8, state, palette)
+    self.assertEqual(py_out, viper_out)
+    self.assertEqual(palette[4*state[3]:4*state[3]+4], py_out[20:24])
+
+  def testNormalizeLed(self):
+    values = (0, 1, 2, 3, 4, 6, 8, 16, 24, 31, 32, 48, 96, 128, 200, 255)
+    for brightness in range(-1, 33):
+      for red in values:
+        for green in values[::3]:
+          py_led = bytearray((0xff, 17, green, red))
+          viper_led = bytearray(py_led)
+          self.assertEqual(
+              apa102._py_inplace_normalize_led(py_led, 1, brightness),
+              apa102._viper_inplace_normalize_led(viper_led, 1, brightness))
+          self.assertEqual(py_led, viper_led)
+
+
+@unittest.skipUnless(shutil.which('micropython'), 'needs MicroPython')
+class TestMicroPython(unittest.TestCase):
+
+  def testViperMatchesPython(self):
+    output = subprocess.check_output(
+        ['micropython', os.path.join('utils', 'bench_kernels.py'), '20'],
+        universal_newlines=True)
+    self.assertIn('viper', output)
+
+
+if __name__ == '__main__':
+  unittest.main()
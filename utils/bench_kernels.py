@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# vim: set sw=4 expandtab ai
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Time the LIFE kernels, pure Python versus viper.
+
+Runs under CPython, where only the pure Python kernels exist, and under
+MicroPython (the unix port or on a board) where the viper kernels are
+timed too and must compute identical generations.
+
+Usage:
+  micropython utils/bench_kernels.py [generations]
+  python3 utils/bench_kernels.py [generations]
+"""
+
+import sys
+
+_here = __file__.rsplit('/', 1)[0] if '/' in __file__ else '.'
+sys.path.insert(0, _here + '/..')  # No os.path on MicroPython.
+import apa102
+import life
+import reseed
+import scheduler
+
+
+def kernel_paths():
+    """(name, next_generation, fill_leds, palette_colors) for each path."""
+    paths = [('python', life.py_next_generation, life.py_fill_leds,
+              life.py_palette_colors)]
+    if life.viper_kernels:
+        paths.append(('viper', life.viper_next_generation,
+                      life.viper_kernels.fill_leds, bytes))
+    return paths
+
+
+def run_generations(next_generation, generations):
+    """Returns (final state, elapsed ms) stepping from the first seed."""
+    state = bytearray(apa102.NUM_DISC_LEDS)
+    for led in reseed.LIBRARY[0]:
+        state[led] = 1
+    start = scheduler.ticks_ms()
+    for _ in range(generations):
+        state = next_generation(life.DISC_NEIGHBORS, state, (2, 3), (2, 5),
+                                len(life.orig))
+    return state, scheduler.ticks_diff(scheduler.ticks_ms(), start)
+
+
+def time_fill(fill_leds, palette_colors, state, frames):
+    palette = palette_colors(b''.join(
+        apa102._brightness(color, 4) for color in [apa102.led_off] + life.orig))
+    out = bytearray(4 + apa102.NUM_DISC_LEDS*4 + 16)
+    start = scheduler.ticks_ms()
+    for _ in range(frames):
+        fill_leds(out, 4, state, palette)
+    return out, scheduler.ticks_diff(scheduler.ticks_ms(), start)
+
+
+def main(argv):
+    generations = int(argv[1]) if len(argv) > 1 else 200
+    results = []
+    for name, next_generation, fill_leds, palette_colors in kernel_paths():
+        state, step_ms = run_generations(next_generation, generations)
+        out, fill_ms = time_fill(fill_leds, palette_colors, state, generations)
+        print('%-6s %9.1f generations/s %9.1f display fills/s' %
+              (name, generations * 1000 / max(1, step_ms),
+               generations * 1000 / max(1, fill_ms)))
+        results.append((state, out))
+    for result in results[1:]:
+        if result != results[0]:
+            print('FAIL: kernel results differ.')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# vim: set sw=4 expandtab ai
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Generations per second of parallel.ParallelLife versus serial stepping.
+
+Steps a chain of stacked discs serially and with 1, 2, 4... sectors up
+to the CPU count, checking every run ends in the same state.
+
+Usage:
+  bench_parallel.py [--discs 32] [--generations 50] [--threads]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import apa102
+import life
+import parallel
+import reseed
+
+
+def seed(discs):
+    return [disc * apa102.NUM_DISC_LEDS + led
+            for disc in range(discs)
+            for led in reseed.LIBRARY[disc % len(reseed.LIBRARY)]]
+
+
+def run_serial(neighbors, initial_state, generations):
+    state = bytearray(len(neighbors))
+    for led in initial_state:
+        state[led] = 1
+    for _ in range(generations):
+        state = life.next_generation(neighbors, state, (2, 3), (2, 5), 7)
+    return bytes(state)
+
+
+def run_parallel(neighbors, initial_state, generations, sectors, processes):
+    engine = parallel.ParallelLife(neighbors, sectors, processes=processes,
+                                   max_alive=7)
+    states = engine.generations(initial_state)
+    try:
+        for _ in range(generations + 1):
+            state = next(states)
+        return bytes(state)
+    finally:
+        states.close()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--discs', type=int, default=32)
+    parser.add_argument('--generations', type=int, default=50)
+    parser.add_argument('--threads', action='store_true',
+                        help='use threads rather than processes')
+    args = parser.parse_args(argv[1:])
+
+    neighbors = parallel.chained_neighbors(copies=args.discs)
+    initial_state = seed(args.discs)
+    print(len(neighbors), 'cells,', os.cpu_count(), 'CPUs')
+    start = time.perf_counter()
+    expected = run_serial(neighbors, initial_state, args.generations)
+    serial_rate = args.generations / (time.perf_counter() - start)
+    print('serial     %8.1f generations/s' % serial_rate)
+
+    sectors = 1
+    while sectors <= max(2, os.cpu_count()):
+        start = time.perf_counter()
+        state = run_parallel(neighbors, initial_state, args.generations,
+                             sectors, not args.threads)
+        rate = args.generations / (time.perf_counter() - start)
+        print('%2d sectors %8.1f generations/s  %4.2fx' %
+              (sectors, rate, rate / serial_rate))
+        if state != expected:
+            print('FAIL: parallel state differs from serial.')
+            return 1
+        sectors *= 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
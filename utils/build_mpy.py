@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# vim: set sw=4 expandtab ai
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Cross compile the MicroPython modules to .mpy files for deployment.
+
+The device then imports precompiled bytecode instead of compiling the
+sources at boot.  --neighbors-data replaces the disc_neighbors module,
+a large tuple literal, with a packed binary table that life loads
+instead.  viper_kernels holds native code so it is only compiled when
+--march names the device's architecture; otherwise its source is copied
+and left for the device to compile, if it can.
+
+--measure runs `import life` under a unix port micropython binary from
+both the sources and the build, reporting import time and peak heap.
+
+Usage:
+  build_mpy.py [--out build] [--march armv7m] [--neighbors-data]
+      [--mpy-cross mpy-cross] [--measure micropython]
+  push2wipy.py 192.168.4.5 build/*
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, SOURCE_DIR)
+import life
+
+MODULES = ('apa102', 'disc_neighbors', 'frametable', 'life', 'patterns',
+           'reseed', 'scheduler', 'stats', 'viper_kernels')
+NEIGHBORS_DATA = 'disc_neighbors.bin'
+
+# Run by micropython from the directory holding the modules.  Garbage
+# collection is disabled so every allocation made while importing is
+# still counted afterwards: the peak.
+_MEASURE_IMPORT = '''
+import gc, sys, time
+sys.path[0:0] = ['']
+gc.collect()
+gc.disable()
+before = gc.mem_alloc()
+start = time.ticks_us()
+import life
+elapsed = time.ticks_diff(time.ticks_us(), start)
+peak = gc.mem_alloc() - before
+gc.enable()
+gc.collect()
+print(elapsed, peak, gc.mem_alloc() - before)
+'''
+
+
+def build(out_dir, mpy_cross='mpy-cross', march=None, neighbors_data=False):
+    """Writes the deployable files to out_dir.  Returns their names."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for module in MODULES:
+        source = os.path.join(SOURCE_DIR, module + '.py')
+        if module == 'disc_neighbors' and neighbors_data:
+            name = NEIGHBORS_DATA
+            with open(os.path.join(out_dir, name), 'wb') as data_file:
+                data_file.write(life.pack_neighbors(life.DISC_NEIGHBORS))
+        elif module == 'viper_kernels' and not march:
+            name = module + '.py'
+            shutil.copyfile(source, os.path.join(out_dir, name))
+        else:
+            name = module + '.mpy'
+            command = [mpy_cross, '-o', os.path.join(out_dir, name)]
+            if march:
+                command.append('-march=' + march)
+            subprocess.check_call(command + [source])
+        written.append(name)
+    return written
+
+
+def measure_import(micropython, module_dir):
+    """(microseconds, peak heap bytes, retained heap bytes) of import life."""
+    output = subprocess.check_output([micropython, '-c', _MEASURE_IMPORT],
+                                     cwd=module_dir, universal_newlines=True)
+    return tuple(int(value) for value in output.split()[-3:])
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='build')
+    parser.add_argument('--mpy-cross', default='mpy-cross')
+    parser.add_argument('--march', help='e.g. armv7m, xtensawin or x64')
+    parser.add_argument('--neighbors-data', action='store_true',
+                        help='ship the disc neighbors as ' + NEIGHBORS_DATA)
+    parser.add_argument('--measure', metavar='MICROPYTHON',
+                        help='unix port binary to measure imports with')
+    args = parser.parse_args(argv[1:])
+
+    for name in build(args.out, args.mpy_cross, args.march,
+                      args.neighbors_data):
+        print('wrote', os.path.join(args.out, name))
+    if args.measure:
+        for label, module_dir in (('source', SOURCE_DIR), ('build', args.out)):
+            elapsed, peak, retained = measure_import(args.measure, module_dir)
+            print('%-6s import life: %7.1f ms, peak heap %6d bytes, '
+                  'retained %6d bytes' % (label, elapsed / 1000, peak, retained))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
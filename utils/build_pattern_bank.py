@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# vim: set sw=4 expandtab ai
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Build a pattern bank of long-lived seeds by simulating candidates.
+
+Usage:
+  build_pattern_bank.py patterns.bin [--candidates 2000] [--keep 32]
+      [--generations 3000] [--seed 1] [--stay-alive 2,3] [--new-born 2,5]
+
+Copy patterns.bin to the device and use it when reseeding:
+
+  bank = patterns.PatternBank.load('/flash/patterns.bin')
+  life.Life(reseeder=reseed.Reseeder(bank=bank)).run()
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import apa102
+import life
+import patterns
+import reseed
+
+
+def score(leds, stay_alive, new_born, generations):
+    """Returns (lifetime, period) of a seed; period is 0 if it died."""
+    state = bytearray(apa102.NUM_DISC_LEDS)
+    for led in leds:
+        state[led] = 1
+    seen = {}
+    for generation in range(generations):
+        if not any(state):
+            return generation, 0
+        key = bytes(1 if age else 0 for age in state)
+        if key in seen:
+            return seen[key], generation - seen[key]
+        seen[key] = generation
+        state = life.next_generation(life.DISC_NEIGHBORS, state,
+                                     stay_alive, new_born, 7)
+    return generations, 0
+
+
+def candidates(count, seed):
+    """Yields count seeds from the reseed strategies and library."""
+    reseeder = reseed.Reseeder(seed=seed, log=None)
+    yield from reseeder.library
+    makers = (reseed.sprinkle, reseed.ring_symmetric)
+    for idx in range(count):
+        yield sorted(set(makers[idx % len(makers)](reseeder.rng, reseeder)))
+
+
+def build(num_candidates, keep, generations, seed, stay_alive, new_born):
+    """Returns the encoded bank of the keep best of num_candidates seeds."""
+    scored = []
+    for leds in candidates(num_candidates, seed):
+        lifetime, period = score(leds, stay_alive, new_born, generations)
+        scored.append((lifetime, period, tuple(leds)))
+    scored.sort(key=lambda s: (-s[0], -s[1], s[2]))
+    return patterns.encode_bank(
+        patterns.encode_record(leds, lifetime, period, stay_alive, new_born)
+        for lifetime, period, leds in scored[:keep])
+
+
+def _rules(text):
+    return tuple(int(count) for count in text.split(',') if count)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output')
+    parser.add_argument('--candidates', type=int, default=2000)
+    parser.add_argument('--keep', type=int, default=32)
+    parser.add_argument('--generations', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--stay-alive', type=_rules, default=(2, 3))
+    parser.add_argument('--new-born', type=_rules, default=(2, 5))
+    args = parser.parse_args(argv[1:])
+
+    data = build(args.candidates, args.keep, args.generations, args.seed,
+                 args.stay_alive, args.new_born)
+    with open(args.output, 'wb') as bank_file:
+        bank_file.write(data)
+    bank = patterns.PatternBank(data)
+    print('Wrote', len(bank), 'patterns,', len(data), 'bytes to', args.output)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
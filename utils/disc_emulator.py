@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# vim: set sw=4 expandtab ai
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""A virtual APA102 LED disc for running the MicroPython code on a PC.
+
+DiscEmulator stands in for machine.SPI.  It records every write, decodes
+the APA102 start frame, LED frames (with their 5-bit global brightness)
+and finish bytes, and maps the bus back onto the DISC_RINGS polar layout
+to render frames as PNG, GIF or ANSI terminal art.
+
+Decoding uses only C level bytes slicing and translate() so long effect
+runs decode at many thousands of frames per second.  numpy speeds up
+rendering and Pillow enables GIF output when they are installed.
+
+Usage:
+  disc_emulator.py target|puddle|cylon|color_chase|life [--frames 100]
+      [--png out.png] [--gif out.gif]
+"""
+
+import argparse
+import math
+import os
+import struct
+import sys
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import apa102
+from apa102 import DISC_RINGS, NUM_DISC_LEDS
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_HEADER_BITS = bytes(b & 0xe0 for b in range(256))
+_BRIGHTNESS_BITS = bytes(b & 0x1f for b in range(256))
+_NO_LED = NUM_DISC_LEDS  # Pixels between LEDs map past the last LED.
+# LED PWM duty cycles are linear light, images are (roughly) sRGB.
+_LINEAR_TO_SRGB = bytes(round(255 * (v / 255) ** (1 / 2.2)) for v in range(256))
+
+
+class LedFrame(object):
+    """One decoded write to the LED bus.  Channels are bytes, one per LED."""
+    __slots__ = ('brightness', 'red', 'green', 'blue')
+
+    def __init__(self, brightness, red, green, blue):
+        self.brightness = brightness
+        self.red = red
+        self.green = green
+        self.blue = blue
+
+    def __len__(self):
+        return len(self.brightness)
+
+    def __getitem__(self, led_slice):
+        """LED subset of this frame such as frame[offset:offset+255]."""
+        return LedFrame(self.brightness[led_slice], self.red[led_slice],
+                        self.green[led_slice], self.blue[led_slice])
+
+    def led(self, idx):
+        """(brightness, red, green, blue) of LED idx."""
+        return (self.brightness[idx], self.red[idx], self.green[idx],
+                self.blue[idx])
+
+    def lit(self):
+        """Bytes with 1 for each LED emitting any light, else 0."""
+        return bytes(1 if b and (r or g or bl) else 0 for b, r, g, bl in
+                     zip(self.brightness, self.red, self.green, self.blue))
+
+    def rgb(self):
+        """Brightness scaled, gamma encoded (r, g, b) for each LED."""
+        srgb = _LINEAR_TO_SRGB
+        return [(srgb[r * b // 31], srgb[g * b // 31], srgb[bl * b // 31])
+                for b, r, g, bl in
+                zip(self.brightness, self.red, self.green, self.blue)]
+
+
+def decode(data, num_leds=None):
+    """Decodes a raw APA102 bus write.
+
+    Args:
+      data: The bytes written to SPI.
+      num_leds: Bus length.  When given the write must end with at least
+          num_finish_bytes(num_leds) finish bytes.  When None it is
+          inferred from the trailing 0xff finish bytes, so a trailing
+          full brightness white LED will be mistaken for finish bytes.
+
+    Returns:
+      A LedFrame.
+
+    Raises:
+      ValueError: If data is not a well formed APA102 write.
+    """
+    data = bytes(data)
+    if data[:4] != apa102.START_FRAME:
+        raise ValueError('missing start frame')
+    if num_leds is None:
+        led_bytes = len(data.rstrip(b'\xff')) - 4
+        num_leds = max(0, (led_bytes + 3) // 4)
+        min_finish = 1
+    else:
+        min_finish = apa102.num_finish_bytes(num_leds)
+    end = 4 + num_leds * 4
+    finish = data[end:]
+    if len(finish) < min_finish or finish.strip(b'\xff'):
+        raise ValueError('missing or bad finish bytes')
+    headers = data[4:end:4]
+    if headers.translate(_HEADER_BITS) != b'\xe0' * num_leds:
+        raise ValueError('LED frame without 111 header bits')
+    # The strand order is brightness, blue, green, red.
+    return LedFrame(headers.translate(_BRIGHTNESS_BITS), data[7:end:4],
+                    data[6:end:4], data[5:end:4])
+
+
+class DiscEmulator(object):
+    def __init__(self, bus_offset=0, keep_frames=True, num_leds=0):
+        """An emulated SPI bus with an LED disc at bus_offset.
+
+        Args:
+          bus_offset: The number of LEDs on the bus before the disc.
+          keep_frames: Record every write, else only the latest.
+          num_leds: Bus length passed to decode(), <= 0 for a bus ending
+              with the disc.  None infers it from each write, mistaking a
+              full white last LED for finish bytes.
+        """
+        self.bus_offset = bus_offset
+        if num_leds is not None and num_leds <= 0:
+            num_leds = bus_offset + NUM_DISC_LEDS
+        self.num_leds = num_leds
+        self.keep_frames = keep_frames
+        self.writes = []
+
+    # The machine.SPI interface.
+    MASTER = 'MASTER'
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def deinit(self):
+        pass
+
+    def write(self, data):
+        if self.keep_frames:
+            self.writes.append(bytes(data))
+        else:
+            self.writes[:] = [bytes(data)]
+        return len(data)
+
+    def machine(self):
+        """Returns an object to install as sys.modules['machine']."""
+        emulator = self
+
+        class Machine(object):
+            class SPI(object):
+                MASTER = DiscEmulator.MASTER
+
+                def __new__(cls, bus=0):
+                    return emulator
+        return Machine
+
+    def frames(self):
+        """Decodes the disc portion of every recorded write."""
+        return [decode(data, self.num_leds)[
+                    self.bus_offset:self.bus_offset + NUM_DISC_LEDS]
+                for data in self.writes]
+
+    def frame(self, idx=-1):
+        return decode(self.writes[idx], self.num_leds)[
+            self.bus_offset:self.bus_offset + NUM_DISC_LEDS]
+
+
+def disc_positions():
+    """(x, y) in [-1, 1] of each disc LED, ring 0 outermost."""
+    positions = []
+    for ring, size in enumerate(DISC_RINGS):
+        radius = (len(DISC_RINGS) - 1 - ring) / (len(DISC_RINGS) - 1)
+        for led in range(size):
+            angle = 2 * math.pi * led / size
+            positions.append((radius * math.cos(angle),
+                              radius * math.sin(angle)))
+    return positions
+
+
+_pixel_maps = {}
+
+
+def pixel_map(width, height):
+    """Returns a list mapping each pixel, row major, to a disc LED or _NO_LED."""
+    key = (width, height)
+    if key in _pixel_maps:
+        return _pixel_maps[key]
+    pixels = [_NO_LED] * (width * height)
+    # Leave a small border and draw dots a bit smaller than ring spacing.
+    scale_x = 0.95 * (width - 1) / 2
+    scale_y = 0.95 * (height - 1) / 2
+    dot = 0.4 / (len(DISC_RINGS) - 1)
+    for led, (x, y) in enumerate(disc_positions()):
+        center_x = (width - 1) / 2 + x * scale_x
+        center_y = (height - 1) / 2 + y * scale_y
+        for py in range(max(0, int(center_y - dot * scale_y)),
+                        min(height, int(center_y + dot * scale_y) + 2)):
+            for px in range(max(0, int(center_x - dot * scale_x)),
+                            min(width, int(center_x + dot * scale_x) + 2)):
+                dx = (px - center_x) / scale_x
+                dy = (py - center_y) / scale_y
+                if dx * dx + dy * dy <= dot * dot:
+                    pixels[py * width + px] = led
+    _pixel_maps[key] = pixels
+    return pixels
+
+
+def render_rgb(frame, width=256, height=256):
+    """Returns width*height*3 bytes of RGB pixels picturing the disc."""
+    pixels = pixel_map(width, height)
+    palette = frame.rgb() + [(0, 0, 0)] * (_NO_LED + 1 - len(frame))  # Off.
+    if numpy is not None:
+        palette = numpy.array(palette, dtype=numpy.uint8)
+        return palette[numpy.array(pixels)].tobytes()
+    return b''.join(bytes(palette[led]) for led in pixels)
+
+
+def write_png(path, frame, width=256, height=256):
+    rgb = render_rgb(frame, width, height)
+    stride = width * 3
+    raw = b''.join(b'\x00' + rgb[row:row + stride]
+                   for row in range(0, len(rgb), stride))
+
+    def chunk(kind, body):
+        return (struct.pack('>I', len(body)) + kind + body +
+                struct.pack('>I', zlib.crc32(kind + body)))
+    with open(path, 'wb') as png:
+        png.write(b'\x89PNG\r\n\x1a\n' +
+                  chunk(b'IHDR', struct.pack('>IIBBBBB', width, height,
+                                             8, 2, 0, 0, 0)) +
+                  chunk(b'IDAT', zlib.compress(raw, 9)) +
+                  chunk(b'IEND', b''))
+
+
+def write_gif(path, frames, width=128, height=128, ms_per_frame=50):
+    """Writes an animated GIF.  Requires Pillow."""
+    from PIL import Image
+    images = [Image.frombytes('RGB', (width, height),
+                              render_rgb(frame, width, height))
+              for frame in frames]
+    images[0].save(path, save_all=True, append_images=images[1:],
+                   duration=ms_per_frame, loop=0)
+
+
+def render_terminal(frame, width=48, height=24):
+    """Returns the disc as ANSI 24-bit color text."""
+    rgb = render_rgb(frame, width, height)
+    lines = []
+    for row in range(height):
+        line = []
+        for col in range(width):
+            offset = (row * width + col) * 3
+            r, g, b = rgb[offset:offset + 3]
+            line.append('\x1b[48;2;%d;%d;%dm ' % (r, g, b))
+        lines.append(''.join(line) + '\x1b[0m')
+    return '\n'.join(lines)
+
+
+def _run_effect(name, num_frames):
+    """Runs an effect's frame generator for num_frames frames."""
+    import life
+    if name == 'life':
+        life.Life().run(iterations=num_frames, sleep_ms=0)
+        return
+    if name == 'target':
+        steps = apa102._test_frames(apa102._target_data(2, 0),
+                                    NUM_DISC_LEDS, 1)
+    elif name == 'puddle':
+        steps = apa102._puddle_frames(3, 0, 0)
+    elif name == 'cylon':
+        steps = apa102._cylon_frames(0, 0, (b'\xff\x22\x33\x40',), False)
+    elif name == 'color_chase':
+        steps = apa102._test_frames(apa102._color_chase_data(), 0, 1)
+    else:
+        raise ValueError('unknown effect ' + name)
+    for _, _ in zip(range(num_frames), steps):
+        pass
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('effect')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--png', help='write the last frame here')
+    parser.add_argument('--gif', help='write an animation here')
+    args = parser.parse_args(argv[1:])
+
+    # target() also lights a strand after the disc yet sends finish bytes
+    # for the disc alone, so infer its bus length.  The rest end at the disc.
+    emulator = DiscEmulator(num_leds=None if args.effect == 'target' else 0)
+    sys.modules['machine'] = emulator.machine()
+    apa102.spi = emulator
+    _run_effect(args.effect, args.frames)
+    frames = emulator.frames()
+    print(render_terminal(frames[-1]))
+    print(len(frames), 'frames')
+    if args.png:
+        write_png(args.png, frames[-1])
+    if args.gif:
+        write_gif(args.gif, frames)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -4,28 +4,53 @@
 # Released under the Apache 2.0 license.
 # http://www.apache.org/licenses/
 
-"""Push a file to a wipy's /flash directory via ftp.
+"""Push files to a wipy's /flash directory via ftp.
+
+Pushing a module as .py or .mpy deletes the other form from /flash so a
+stale copy cannot shadow it, as does pushing a data file standing in for
+a module.  See build_mpy.py.
 
 Usage:
-  push2wipy.py 192.168.4.5 myfile.py
+  push2wipy.py 192.168.4.5 myfile.py [morefile.mpy ...]
+  push2wipy.py 192.168.4.5 build/*
 """
 
 import ftplib
 import os
 import sys
 
+# Data files that life loads when the module of the same name is absent.
+MODULE_DATA_FILES = ('disc_neighbors.bin',)
+
+
+def stale_files(existing, pushing):
+    """The names in existing made stale by pushing the files in pushing."""
+    pushed = [os.path.basename(filename) for filename in pushing]
+    stale = set()
+    for name in pushed:
+        stem, extension = os.path.splitext(name)
+        if extension in ('.py', '.mpy') or name in MODULE_DATA_FILES:
+            stale.update((stem + '.py', stem + '.mpy'))
+    return sorted(stale.intersection(existing).difference(pushed))
+
 
 def main(argv):
-    hostname, filename = argv[1:]
+    hostname = argv[1]
+    filenames = argv[2:]
+    if not filenames:
+        raise ValueError('no files to push')
     with ftplib.FTP(host=hostname, timeout=10,
                     user='micro', passwd='python') as wipy_ftp:
       wipy_ftp.set_pasv(True)
       print('connected:', wipy_ftp.getwelcome())
       print('cd flash:', wipy_ftp.cwd('flash'))
-      with open(filename, 'rb') as binaryfile:
-          basename = os.path.basename(filename)
-          command = 'STOR {}'.format(basename)
-          print(command+':', wipy_ftp.storbinary(command, binaryfile))
+      for name in stale_files(wipy_ftp.nlst(), filenames):
+          print('DELE {}:'.format(name), wipy_ftp.delete(name))
+      for filename in filenames:
+          with open(filename, 'rb') as binaryfile:
+              basename = os.path.basename(filename)
+              command = 'STOR {}'.format(basename)
+              print(command+':', wipy_ftp.storbinary(command, binaryfile))
       print('WiPy /flash contents via dir():')
       wipy_ftp.dir()
 
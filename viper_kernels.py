@@ -0,0 +1,95 @@
+# MicroPython
+# vim: set sw=2 ai expandtab
+#
+# Released under the Apache 2.0 license.
+# http://www.apache.org/licenses/
+
+"""Viper compiled versions of the hot loops in life and apa102.
+
+Importing this fails on CPython (no micropython module) and on ports
+without the native emitter (SyntaxError); life and apa102 then fall back
+to their pure Python versions.  Viper functions take at most four
+arguments so tables and rules are passed packed.
+"""
+
+import micropython
+
+
+@micropython.viper
+def step(table, current, nxt, rules: int):
+  """Writes the generation after current into nxt.
+
+  Args:
+    table: life.pack_neighbors() output.  u16 offsets of where each LED's
+        neighbor list starts, then the neighbor lists as bytes.
+    current: A bytearray of each LED's age, 0 being dead.
+    nxt: A bytearray the same size as current to write into.
+    rules: life.pack_rules() output.
+  """
+  num_leds = int(len(current))
+  starts = ptr16(table)
+  neighbors = ptr8(table)
+  state = ptr8(current)
+  out = ptr8(nxt)
+  stay_alive = rules & 0xff
+  new_born = (rules >> 8) & 0xff
+  max_alive = rules >> 16
+  for led in range(num_leds):
+    live_neighbors = 0
+    for idx in range(starts[led], starts[led+1]):
+      if state[neighbors[idx]]:
+        live_neighbors += 1
+    while live_neighbors >= 7:
+      live_neighbors -= 7  # HACK, for torus to be meaningful.
+    age = state[led]
+    if age:
+      if (stay_alive >> live_neighbors) & 1:
+        age += 1
+        if age > max_alive:
+          age = max_alive
+        out[led] = age
+      else:
+        out[led] = 0  # death
+    elif (new_born >> live_neighbors) & 1:
+      out[led] = 1  # birth
+    else:
+      out[led] = 0
+
+
+@micropython.viper
+def fill_leds(out, offset: int, state, palette):
+  """Copies the 4 byte palette entry for each age in state into out."""
+  dst = ptr8(out)
+  ages = ptr8(state)
+  colors = ptr8(palette)
+  num_leds = int(len(state))
+  for led in range(num_leds):
+    color = ages[led] << 2
+    dst[offset] = colors[color]
+    dst[offset+1] = colors[color+1]
+    dst[offset+2] = colors[color+2]
+    dst[offset+3] = colors[color+3]
+    offset += 4
+
+
+@micropython.viper
+def normalize_led(led_data, offset: int, brightness: int, tables) -> int:
+  """apa102._inplace_normalize_led() with its two 32 byte tables joined."""
+  if brightness >= 16 or brightness <= 0:
+    return brightness
+  data = ptr8(led_data)
+  lsz = ptr8(tables)
+  shift = 5
+  for idx in range(offset, offset+3):
+    zeros = lsz[data[idx] & 0x1f]
+    if zeros < shift:
+      shift = zeros
+  if shift:
+    max_shift = lsz[32 + brightness]
+    if max_shift < shift:
+      shift = max_shift
+  if shift:
+    brightness <<= shift
+    for idx in range(offset, offset+3):
+      data[idx] = data[idx] >> shift
+  return brightness